@@ -4,11 +4,35 @@ Manages application state including settings, favorites, and undo/redo history.
 Persists user preferences to JSON file and maintains undo/redo stacks for edits.
 """
 
+import copy
 import json
 import os
+from collections import OrderedDict, deque
 
 from core.constants import MAX_RECENT_FILES, MAX_UNDO_STACK_SIZE
 
+# Parsed settings keyed by (path, mtime_ns, size) so repeated AppState
+# construction does not re-read an unchanged file
+_SETTINGS_CACHE = {}
+
+
+class UndoAction:
+    """
+    A single cell edit recorded on the undo stack.
+
+    Uses __slots__ so the up to MAX_UNDO_STACK_SIZE entries stay compact
+    and attribute access avoids a per-instance dict lookup.
+    """
+
+    __slots__ = ("table", "column", "old", "new", "pk")
+
+    def __init__(self, table, column, old, new, pk):
+        self.table = table
+        self.column = column
+        self.old = old
+        self.new = new
+        self.pk = pk
+
 
 class AppState:
     """
@@ -28,11 +52,14 @@ class AppState:
             Creates default settings if file doesn't exist.
         """
         self.settings_file = settings_file
-        self.undo_stack = []
-        self.redo_stack = []
+        self._last_saved_data = None
+        self.undo_stack = deque(maxlen=MAX_UNDO_STACK_SIZE)
+        self.redo_stack = deque(maxlen=MAX_UNDO_STACK_SIZE)
         self.settings = self.load_settings()
         self.favorites = self.settings.get("favorites", [])
-        self.recents = self.settings.get("recents", [])
+        # Stored oldest-first so move-to-front is an O(1) append at the end
+        self._recents = OrderedDict.fromkeys(
+            reversed(self.settings.get("recents", [])[:MAX_RECENT_FILES]))
         self.column_widths = self.settings.get("column_widths", {})
         self.column_visibility = self.settings.get("column_visibility", {})
         self.column_presets = self.settings.get("column_presets", {})
@@ -47,12 +74,18 @@ class AppState:
 
         Notes:
             Returns default settings if file doesn't exist or is invalid.
+            Parsed files are cached per (path, mtime, size); callers get a
+            deep copy so instances never share mutable state.
         """
         if os.path.exists(self.settings_file):
             try:
-                with open(self.settings_file, "r") as file:
-                    return json.load(file)
-            except (json.JSONDecodeError, OSError):
+                st = os.stat(self.settings_file)
+                key = (self.settings_file, st.st_mtime_ns, st.st_size)
+                if key not in _SETTINGS_CACHE:
+                    with open(self.settings_file, "rb") as file:
+                        _SETTINGS_CACHE[key] = json.loads(file.read())
+                return copy.deepcopy(_SETTINGS_CACHE[key])
+            except (ValueError, OSError):
                 pass
         return {
             "favorites": [],
@@ -63,7 +96,7 @@ class AppState:
             "recents": [],
         }
 
-    def save_settings(self, window_geometry, is_maximized, lookup_mode):
+    def save_settings(self, window_geometry, is_maximized, lookup_mode, fsync=False):
         """
         Persist current application settings to JSON file.
 
@@ -71,6 +104,14 @@ class AppState:
             window_geometry (str): Window size and position (e.g., "1200x800+100+50")
             is_maximized (bool): Whether window is maximized
             lookup_mode (bool): Whether lookup mode is enabled
+            fsync (bool, optional): Flush the file to disk before replacing
+                the original. Only worth the cost on the final save at exit.
+
+        Notes:
+            Settings are encoded in a single pass and written to a temporary
+            file that atomically replaces the original, so a crash mid-save
+            never leaves a truncated settings file behind. The write is
+            skipped when the encoded settings match the last saved payload.
         """
         self.settings["favorites"] = self.favorites
         self.settings["recents"] = self.recents
@@ -80,8 +121,24 @@ class AppState:
         self.settings["window_size"] = window_geometry
         self.settings["is_maximized"] = is_maximized
         self.settings["lookup_mode"] = lookup_mode
-        with open(self.settings_file, "w") as file:
-            json.dump(self.settings, file, indent=4)
+        data = json.dumps(self.settings, indent=4)
+        if data == self._last_saved_data:
+            return
+        temp_file = self.settings_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_file, self.settings_file)
+        self._last_saved_data = data
+        for key in [k for k in _SETTINGS_CACHE if k[0] == self.settings_file]:
+            del _SETTINGS_CACHE[key]
+
+    @property
+    def recents(self):
+        """list[str]: Recent file paths, most recently opened first."""
+        return list(reversed(self._recents))
 
     def add_recent(self, path):
         """
@@ -90,24 +147,31 @@ class AppState:
         Args:
             path (str): File path to add
         """
-        if path in self.recents:
-            self.recents.remove(path)
-        self.recents.insert(0, path)
-        self.recents = self.recents[:MAX_RECENT_FILES]
+        self._recents.pop(path, None)
+        self._recents[path] = None
+        while len(self._recents) > MAX_RECENT_FILES:
+            self._recents.popitem(last=False)
+
+    def remove_recent(self, path):
+        """
+        Remove file path from the recent files list if present.
+
+        Args:
+            path (str): File path to remove
+        """
+        self._recents.pop(path, None)
 
     # ------------------------------------------------------------------
     # Undo / Redo
     # ------------------------------------------------------------------
 
-    def _trim_undo_stack(self):
-        """Trim undo stack to MAX_UNDO_STACK_SIZE, dropping oldest entries."""
-        if len(self.undo_stack) > MAX_UNDO_STACK_SIZE:
-            self.undo_stack = self.undo_stack[-MAX_UNDO_STACK_SIZE:]
-
     def push_undo(self, table, col, old, new, pk):
         """
         Add an edit action to the undo stack.
 
+        The stack is bounded by MAX_UNDO_STACK_SIZE; pushing past the limit
+        silently drops the oldest entry.
+
         Args:
             table (str): Table name where edit occurred
             col (str): Column name that was edited
@@ -115,12 +179,8 @@ class AppState:
             new: New value after edit
             pk: Primary key value identifying the row
         """
-        self.undo_stack.append({
-            "table": table, "column": col,
-            "old": old, "new": new, "pk": pk,
-        })
+        self.undo_stack.append(UndoAction(table, col, old, new, pk))
         self.redo_stack.clear()
-        self._trim_undo_stack()
 
     def push_action(self, action):
         """
@@ -131,14 +191,14 @@ class AppState:
         """
         self.undo_stack.append(action)
         self.redo_stack.clear()
-        self._trim_undo_stack()
 
     def undo(self):
         """
         Pop the most recent action from undo stack and add to redo stack.
 
         Returns:
-            dict or None: Action dictionary, or None if undo stack is empty
+            UndoAction, dict or None: Cell edit or action dictionary, or None
+            if undo stack is empty
         """
         if not self.undo_stack:
             return None
@@ -151,7 +211,8 @@ class AppState:
         Pop the most recent action from redo stack and add back to undo stack.
 
         Returns:
-            dict or None: Action dictionary, or None if redo stack is empty
+            UndoAction, dict or None: Cell edit or action dictionary, or None
+            if redo stack is empty
         """
         if not self.redo_stack:
             return None
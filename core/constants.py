@@ -3,33 +3,41 @@ Application-wide constants for PCM Database Tools.
 
 This module contains all magic numbers and configuration values
 used throughout the application, centralized for easy maintenance.
+Values are annotated ``Final`` so type checkers flag accidental rebinding.
 """
 
+from typing import Final
+
 # App metadata
-APP_NAME = "PCM Database Tools"
-APP_VERSION = "1.1.0"
+APP_NAME: Final = "PCM Database Tools"
+APP_VERSION: Final = "1.1.0"
 
 # Pagination settings
-ROW_CHUNK_SIZE = 50  # Number of rows loaded per scroll chunk
-COL_CHUNK_SIZE = 15  # Number of columns loaded per scroll chunk
+ROW_CHUNK_SIZE: Final = 50  # Number of rows loaded per scroll chunk
+COL_CHUNK_SIZE: Final = 15  # Number of columns loaded per scroll chunk
 
 # Database operations
-DB_CHUNK_SIZE = 900  # SQLite parameter limit safety margin for bulk operations
+DB_CHUNK_SIZE: Final = 900  # SQLite parameter limit safety margin for bulk operations
+STATEMENT_CACHE_SIZE: Final = 512  # Prepared statements kept per SQLite connection
+SEARCH_INDEX_MIN_ROWS: Final = 5000  # Tables at least this large get an in-memory search index
+CSV_BATCH_SIZE: Final = 5000  # Rows bound per executemany batch during CSV import
+CSV_WRITE_BUFFER: Final = 1 << 20  # File buffer size in bytes for CSV export (1 MiB)
+CSV_EXPORT_WORKERS: Final = 4  # Threads used to export tables in parallel
 
 # UI delays (milliseconds)
-SEARCH_DEBOUNCE_DELAY = 300  # Delay before executing database search
-FILTER_DEBOUNCE_DELAY = 200  # Delay before filtering sidebar table list
+SEARCH_DEBOUNCE_DELAY: Final = 300  # Delay before executing database search
+FILTER_DEBOUNCE_DELAY: Final = 200  # Delay before filtering sidebar table list
 
 # Recent files
-MAX_RECENT_FILES = 10  # Maximum number of recent files to track
+MAX_RECENT_FILES: Final = 10  # Maximum number of recent files to track
 
 # Table view
-DEFAULT_COLUMN_WIDTH = 140  # Default pixel width for table columns
-RESIZE_SAVE_DELAY = 500  # Delay in ms before saving column width changes
+DEFAULT_COLUMN_WIDTH: Final = 140  # Default pixel width for table columns
+RESIZE_SAVE_DELAY: Final = 500  # Delay in ms before saving column width changes
 
 # Undo/Redo
-MAX_UNDO_STACK_SIZE = 100  # Maximum number of undo operations to track
+MAX_UNDO_STACK_SIZE: Final = 100  # Maximum number of undo operations to track
 
 # Window defaults
-DEFAULT_WINDOW_WIDTH = 1200
-DEFAULT_WINDOW_HEIGHT = 800
+DEFAULT_WINDOW_WIDTH: Final = 1200
+DEFAULT_WINDOW_HEIGHT: Final = 800
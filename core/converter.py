@@ -5,6 +5,7 @@ This module wraps the external SQLiteExporter tool to convert between
 Pro Cycling Manager's proprietary CDB format and SQLite databases.
 """
 
+import json
 import os
 import shutil
 import subprocess
@@ -24,6 +25,91 @@ else:
 TOOL_PATH = os.path.join(BASE_PATH, "SQLiteExporter", "SQLiteExporter.exe")
 
 
+# Name of the working SQLite copy in the temp directory, and the suffix of
+# the stamp file next to it recording which CDB it was exported from
+WORKING_DB_NAME = "pcm_working_db.sqlite"
+_STAMP_SUFFIX = ".source.json"
+
+# Suppress the console window SQLiteExporter would otherwise flash on Windows
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _run_tool(args):
+    """Run SQLiteExporter with the given arguments, discarding its console output.
+
+    stdin/stdout are detached so a chatty tool can never stall on a full
+    pipe or wait for input; errors still surface via ``check=True`` with
+    the tool's stderr attached to the raised CalledProcessError.
+    """
+    subprocess.run(
+        [TOOL_PATH, *args], check=True,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE, creationflags=_CREATION_FLAGS,
+    )
+
+
+def _source_key(cdb_path):
+    """Return the (abs_path, mtime_ns, size) identity of a CDB file."""
+    abs_cdb_path = os.path.abspath(cdb_path)
+    st = os.stat(abs_cdb_path)
+    return [abs_cdb_path, st.st_mtime_ns, st.st_size]
+
+
+def _read_stamp(sqlite_path):
+    """Return the stamp stored next to a working copy, or None."""
+    try:
+        with open(sqlite_path + _STAMP_SUFFIX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def stamp_working_db(sqlite_path, cdb_path):
+    """Record that a working copy matches the given CDB as of now.
+
+    Writes the CDB's (path, mtime, size) and the working file's own
+    (mtime, size) next to the working copy. export_cdb_to_sqlite reuses
+    the working copy only while both still match, so any later write to
+    it (unsaved edits) forces a fresh export.
+
+    Args:
+        sqlite_path (str): Path to the working SQLite copy
+        cdb_path (str): Path to the CDB it was exported from
+
+    Notes:
+        Call again after writes that do not change the data, such as the
+        helper indexes db_manager.ensure_fk_indexes() creates, so
+        they do not count as edits.
+    """
+    st = os.stat(sqlite_path)
+    stamp = {
+        "source": _source_key(cdb_path),
+        "working": [st.st_mtime_ns, st.st_size],
+    }
+    with open(sqlite_path + _STAMP_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(stamp, f)
+
+
+def _clear_stamp(sqlite_path):
+    """Forget which CDB a working copy was exported from."""
+    try:
+        os.remove(sqlite_path + _STAMP_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def _is_reusable(sqlite_path, cdb_path):
+    """Return True if the working copy is an untouched export of cdb_path."""
+    stamp = _read_stamp(sqlite_path)
+    if not stamp or stamp.get("source") != _source_key(cdb_path):
+        return False
+    try:
+        st = os.stat(sqlite_path)
+    except OSError:
+        return False
+    return stamp.get("working") == [st.st_mtime_ns, st.st_size]
+
+
 def export_cdb_to_sqlite(cdb_path):
     """
     Convert CDB file to SQLite database in temp directory.
@@ -39,24 +125,42 @@ def export_cdb_to_sqlite(cdb_path):
         FileNotFoundError: If SQLiteExporter.exe not found
 
     Side Effects:
-        - Runs SQLiteExporter.exe subprocess
-        - Creates temporary SQLite file in system temp directory
+        - Copies the .cdb into a scratch folder in the system temp directory
+        - Runs SQLiteExporter.exe subprocess on the scratch copy
+        - Moves the export over the working file and stamps its source
         - Removes existing temp file if present
 
     Notes:
         The SQLite file is created in a temporary location to avoid
-        cluttering the user's working directory.
+        cluttering the user's working directory. Exporting from a scratch
+        copy on the temp volume makes the final move a rename rather than a
+        cross-device copy of the (much larger) SQLite file.
+
+        If the working file is still an untouched export of the same CDB
+        (see stamp_working_db), it is returned as-is without running the
+        converter. A working file holding edits is never reused.
     """
     if not os.path.exists(TOOL_PATH):
         raise FileNotFoundError(f"SQLiteExporter tool not found at: {TOOL_PATH}")
 
     abs_cdb_path = os.path.abspath(cdb_path)
-    temp_sqlite = os.path.join(tempfile.gettempdir(), "pcm_working_db.sqlite")
-    local_sqlite = abs_cdb_path.replace(".cdb", ".sqlite")
-    subprocess.run([TOOL_PATH, "-a", "-export", abs_cdb_path], check=True)
-    if os.path.exists(temp_sqlite):
-        os.remove(temp_sqlite)
-    shutil.move(local_sqlite, temp_sqlite)
+    temp_dir = tempfile.gettempdir()
+    temp_sqlite = os.path.join(temp_dir, WORKING_DB_NAME)
+    if _is_reusable(temp_sqlite, abs_cdb_path):
+        return temp_sqlite
+
+    _clear_stamp(temp_sqlite)
+    scratch_dir = tempfile.mkdtemp(prefix="pcm_export_", dir=temp_dir)
+    try:
+        scratch_cdb = os.path.join(scratch_dir, os.path.basename(abs_cdb_path))
+        shutil.copyfile(abs_cdb_path, scratch_cdb)
+        _run_tool(["-a", "-export", scratch_cdb])
+        if os.path.exists(temp_sqlite):
+            os.remove(temp_sqlite)
+        shutil.move(os.path.splitext(scratch_cdb)[0] + ".sqlite", temp_sqlite)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    stamp_working_db(temp_sqlite, abs_cdb_path)
     return temp_sqlite
 
 
@@ -83,6 +187,11 @@ def import_sqlite_to_cdb(temp_sqlite, target_cdb_path):
     target_base = os.path.splitext(os.path.abspath(target_cdb_path))[0]
     target_sqlite = target_base + ".sqlite"
     shutil.copy2(temp_sqlite, target_sqlite)
-    subprocess.run([TOOL_PATH, "-a", "-import", target_base], check=True)
+    # The target CDB is about to change, so the working copy no longer
+    # stands for an untouched export of it
+    stamp = _read_stamp(temp_sqlite)
+    if stamp and stamp.get("source", [None])[0] == os.path.abspath(target_cdb_path):
+        _clear_stamp(temp_sqlite)
+    _run_tool(["-a", "-import", target_base])
     if os.path.exists(target_sqlite):
         os.remove(target_sqlite)
@@ -6,8 +6,61 @@ and import CSV data back into existing tables.
 """
 
 import csv
+import itertools
 import os
+import pathlib
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+
+from core.constants import CSV_BATCH_SIZE, CSV_EXPORT_WORKERS, CSV_WRITE_BUFFER
+
+# Connection pragmas for bulk imports: the working database is a disposable
+# temp copy, so durability is traded for fewer fsyncs and larger caches
+_BULK_IMPORT_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# Read-side pragmas for whole-database export: memory-map pages instead of
+# copying them into the page cache
+_BULK_EXPORT_PRAGMAS = (
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _write_query_csv(cursor, sql, output_path):
+    """Run a query and stream its result set into a CSV file with headers.
+
+    Rows are pulled lazily from the cursor, so memory use stays flat
+    regardless of table size.
+    """
+    cursor.execute(sql)
+    headers = [description[0] for description in cursor.description]
+    with open(output_path, "w", newline="", encoding="utf-8",
+              buffering=CSV_WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(cursor)
+
+
+def _connect_readonly(db_path):
+    """Open a read-only connection tuned for sequential table scans."""
+    uri = pathlib.Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    for pragma in _BULK_EXPORT_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _export_table_worker(db_path, table, output_folder):
+    """Export one table on a connection owned by the calling thread."""
+    with closing(_connect_readonly(db_path)) as conn:
+        csv_path = os.path.join(output_folder, f"{table}.csv")
+        _write_query_csv(conn.cursor(), f"SELECT * FROM [{table}]", csv_path)
 
 
 def export_to_csv(db_path, output_folder):
@@ -24,29 +77,32 @@ def export_to_csv(db_path, output_folder):
         - CSV files are UTF-8 encoded with headers
 
     Notes:
-        System tables (sqlite_*) are excluded from export.
+        System tables (sqlite_*) are excluded from export. Tables are
+        exported concurrently by up to CSV_EXPORT_WORKERS threads, each
+        with its own read-only connection; SQLite releases the GIL while
+        stepping queries, so scans and file writes overlap.
     """
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        )
-        tables = [row[0] for row in cursor.fetchall()]
-
-        for table in tables:
-            cursor.execute(f"SELECT * FROM [{table}]")
-            rows = cursor.fetchall()
-            headers = [description[0] for description in cursor.description]
-
-            csv_path = os.path.join(output_folder, f"{table}.csv")
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-                writer.writerows(rows)
+    with closing(_connect_readonly(db_path)) as conn:
+        tables = [
+            name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+    if not tables:
+        return
+
+    workers = min(CSV_EXPORT_WORKERS, len(tables))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_export_table_worker, db_path, table, output_folder)
+            for table in tables
+        ]
+        for future in futures:
+            future.result()
 
 
 def export_table(db_path, table_name, output_path):
@@ -64,16 +120,8 @@ def export_table(db_path, table_name, output_path):
     Notes:
         CSV is encoded as UTF-8 with standard comma delimiter.
     """
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT * FROM [{table_name}]")
-        rows = cursor.fetchall()
-        headers = [description[0] for description in cursor.description]
-
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            writer.writerows(rows)
+    with closing(_connect_readonly(db_path)) as conn:
+        _write_query_csv(conn.cursor(), f"SELECT * FROM [{table_name}]", output_path)
 
 
 def _build_insert_sql(table_name, headers):
@@ -83,6 +131,54 @@ def _build_insert_sql(table_name, headers):
     return f"INSERT INTO [{table_name}] ({cols}) VALUES ({placeholders})"
 
 
+def _insert_csv_rows(cursor, table_name, headers, reader):
+    """Insert CSV rows in batches of CSV_BATCH_SIZE using one prepared INSERT."""
+    sql = _build_insert_sql(table_name, headers)
+    while True:
+        batch = list(itertools.islice(reader, CSV_BATCH_SIZE))
+        if not batch:
+            break
+        cursor.executemany(sql, batch)
+
+
+@contextmanager
+def _bulk_import(db_path):
+    """Open a connection tuned for bulk loading and run it in one transaction.
+
+    Yields:
+        sqlite3.Cursor: Cursor inside an IMMEDIATE transaction. The
+        transaction is committed on success and rolled back on error, and
+        the connection is always closed.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        for pragma in _BULK_IMPORT_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _import_one(cursor, table_name, csv_path):
+    """Replace a table's rows with the contents of a CSV file.
+
+    A CSV without a header row leaves the table untouched.
+    """
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        headers = next(reader, None)
+        if not headers:
+            return
+        cursor.execute(f"DELETE FROM [{table_name}]")
+        _insert_csv_rows(cursor, table_name, headers, reader)
+
+
 def import_table_from_csv(db_path, table_name, csv_path):
     """
     Import CSV data into existing table (replaces all existing data).
@@ -106,16 +202,33 @@ def import_table_from_csv(db_path, table_name, csv_path):
         - Column order in CSV must match table schema or be a subset
         - CSV is read as UTF-8 encoded
     """
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        with open(csv_path, "r", newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            headers = next(reader, None)
-            if not headers:
-                return
-            cursor.execute(f"DELETE FROM [{table_name}]")
-            cursor.executemany(_build_insert_sql(table_name, headers), reader)
-        conn.commit()
+    with _bulk_import(db_path) as cursor:
+        _import_one(cursor, table_name, csv_path)
+
+
+def import_tables_from_csv(db_path, items):
+    """
+    Import several CSV files into their tables on one connection.
+
+    Args:
+        db_path (str): Path to SQLite database
+        items (list[tuple[str, str]]): (table_name, csv_path) pairs
+
+    Side Effects:
+        - DELETES all existing rows from each listed table
+        - Inserts all rows from the matching CSV file
+        - Commits all changes to database in a single transaction
+
+    Warnings:
+        This operation is destructive for every listed table.
+
+    Notes:
+        Opening the connection, applying bulk-load pragmas and committing
+        happen once for the whole batch rather than once per table.
+    """
+    with _bulk_import(db_path) as cursor:
+        for table_name, csv_path in items:
+            _import_one(cursor, table_name, csv_path)
 
 
 def import_from_csv(db_path, input_folder):
@@ -130,7 +243,7 @@ def import_from_csv(db_path, input_folder):
         - Deletes all existing data from each matched table
         - Imports CSV data into tables with matching names (case-insensitive)
         - Skips CSV files that don't match any table name
-        - Commits all changes to database
+        - Commits all changes to database in a single transaction
 
     Warnings:
         This operation is destructive for all matched tables.
@@ -140,26 +253,23 @@ def import_from_csv(db_path, input_folder):
         - Matching is case-insensitive
         - Each CSV first row must contain column headers
     """
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        existing_tables = {row[0].lower(): row[0] for row in cursor.fetchall()}
-
-        files = [f for f in os.listdir(input_folder) if f.lower().endswith(".csv")]
-
-        for file in files:
-            table_key = os.path.splitext(file)[0].lower()
-            if table_key not in existing_tables:
-                continue
-
-            table_name = existing_tables[table_key]
-            with open(os.path.join(input_folder, file), "r", newline="", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                headers = next(reader, None)
-                if not headers:
-                    continue
-                cursor.execute(f"DELETE FROM [{table_name}]")
-                cursor.executemany(
-                    _build_insert_sql(table_name, headers), reader
-                )
-        conn.commit()
+    with _bulk_import(db_path) as cursor:
+        existing_tables = {
+            name.casefold(): name
+            for (name,) in cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            )
+        }
+
+        with os.scandir(input_folder) as it:
+            files = [
+                (entry.path, entry.name.casefold()) for entry in it
+                if entry.name.casefold().endswith(".csv")
+                and entry.is_file(follow_symlinks=False)
+            ]
+
+        for file_path, folded_name in files:
+            table_name = existing_tables.get(folded_name[:-4])
+            if table_name is not None:
+                _import_one(cursor, table_name, file_path)
@@ -6,12 +6,138 @@ with support for foreign key lookups and schema caching.
 """
 
 import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
 
-from core.constants import DB_CHUNK_SIZE
+from core.constants import (
+    DB_CHUNK_SIZE, SEARCH_INDEX_MIN_ROWS, STATEMENT_CACHE_SIZE,
+)
 
 # Preferred display columns when resolving foreign keys (tried in order)
 _FK_DISPLAY_COLUMNS = ["gene_sz_name", "name", "szName", "sz_name"]
 
+# Table prefixes tried, in order, when resolving an fkID<suffix> column
+_FK_TABLE_PREFIXES = ("DYN_", "STA_", "GAM_")
+
+# Name prefix for the helper indexes this tool adds on fkID* columns, so they
+# can be told apart from the game's own schema and dropped before saving
+_FK_INDEX_PREFIX = "pcmtools_fk_"
+
+# Trigram FTS5 tables index every 3-character substring, so a MATCH on a
+# quoted phrase of at least this many characters is equivalent to LIKE '%term%'
+_TRIGRAM_MIN_TERM = 3
+
+# Characters that can appear in the text form of an INTEGER value, plus the
+# LIKE wildcards (a term containing them may match anything)
+_INTEGER_LIKE_CHARS = frozenset("0123456789-%_")
+
+# LIKE wildcards; terms holding them skip the trigram index, where they
+# would be matched literally
+_LIKE_WILDCARDS = frozenset("%_")
+
+# Connection tuning for the editor's working copy. WAL is deliberately not
+# used: committed pages would sit in the -wal file, and saving copies only
+# the main database file back through SQLiteExporter.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _could_match_integer(search_term):
+    """Return True if ``LIKE '%term%'`` can match the text of an integer."""
+    return set(search_term) <= _INTEGER_LIKE_CHARS
+
+
+def _can_use_trigram_index(search_term):
+    """Return True if the trigram index can prefilter this search term."""
+    return (len(search_term) >= _TRIGRAM_MIN_TERM
+            and not _LIKE_WILDCARDS & set(search_term))
+
+
+@lru_cache(maxsize=256)
+def _like_clause(search_fields):
+    """Return the OR-chain of LIKE tests for a tuple of SQL expressions.
+
+    Memoized so that typing in the search box reassembles the clause once
+    per column set rather than on every keystroke. No CAST is needed: LIKE
+    already compares the text form of numeric values.
+    """
+    return " OR ".join(f"{field} LIKE ?" for field in search_fields)
+
+
+@contextmanager
+def _index_transaction(db_path):
+    """Open a short-lived connection and run it in one IMMEDIATE transaction.
+
+    Yields:
+        sqlite3.Cursor: Cursor inside the transaction. It is committed on
+        success and rolled back on error, and the connection is always
+        closed.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def ensure_fk_indexes(db_path):
+    """
+    Create an index on every fkID* column that lacks one of ours.
+
+    Speeds up lookup joins, FK sorting and filtering. All indexes are
+    created in a single transaction.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Notes:
+        Runs on its own connection rather than a DatabaseManager's, so the
+        editor can call it from a background task while its
+        DatabaseManager keeps serving the UI thread. The indexes are not
+        part of the game's schema; call drop_fk_indexes() before handing
+        the database back to SQLiteExporter.
+    """
+    with _index_transaction(db_path) as cursor:
+        tables = [row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()]
+        for table in tables:
+            columns = [row[1] for row in cursor.execute(
+                f"PRAGMA table_info([{table}])").fetchall()]
+            for col in columns:
+                if col.startswith("fkID") and len(col) > 4:
+                    cursor.execute(
+                        f"CREATE INDEX IF NOT EXISTS "
+                        f"[{_FK_INDEX_PREFIX}{table}_{col}] ON [{table}]([{col}])"
+                    )
+
+
+def drop_fk_indexes(db_path):
+    """
+    Drop all helper indexes created by ensure_fk_indexes().
+
+    Args:
+        db_path (str): Path to the SQLite database file
+    """
+    with _index_transaction(db_path) as cursor:
+        names = [row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE ?",
+            (f"{_FK_INDEX_PREFIX}%",),
+        ).fetchall()]
+        for name in names:
+            cursor.execute(f"DROP INDEX IF EXISTS [{name}]")
+
 
 class DatabaseManager:
     """
@@ -30,9 +156,36 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self.schema_cache = {}
+        self._pk_cache = {}
+        # table -> column keyset pagination may seek on, or None
+        self._seek_col_cache = {}
+        self._int_cols_cache = {}
+        self._fk_display_cache = {}
+        self._fk_resolution_cache = {}
+        self._fk_plan_cache = {}
+        self._select_cache = {}
+        self._row_count_cache = {}
+        # table -> declared-INTEGER columns verified to hold only integers
+        self._int_only_cache = {}
+        # table -> name of its TEMP trigram FTS5 table, or None if unindexed
+        self._search_index = {}
         self.table_map_cache = None
+        self._fk_target_map = {}
+        # fk_column -> (target_table, {display: id})
         self._fk_options_cache = {}
-        self.conn = sqlite3.connect(db_path)
+        # (table, columns) -> INSERT statement text, so repeated inserts hit
+        # the connection's prepared-statement cache with an identical string
+        self._insert_sql_cache = {}
+        self._batch_depth = 0
+        # Autocommit mode: transactions are opened explicitly by batch()
+        # instead of by the sqlite3 module's implicit-BEGIN heuristics.
+        self.conn = sqlite3.connect(
+            db_path, isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            self.conn.execute(pragma)
+        self._data_version = self._read_data_version()
 
     def close(self):
         """Close the persistent database connection."""
@@ -40,6 +193,25 @@ class DatabaseManager:
             self.conn.close()
             self.conn = None
 
+    def reset_caches(self):
+        """Forget all cached schema, FK resolution and table-content data.
+
+        Call after changing the database schema (adding or altering
+        tables); ordinary row edits keep the caches valid on their own.
+        This also empties the memoized search clauses and INSERT
+        statements built from the old column lists.
+        """
+        for cache in (self.schema_cache, self._pk_cache,
+                      self._seek_col_cache, self._int_cols_cache,
+                      self._fk_display_cache, self._fk_resolution_cache,
+                      self._fk_plan_cache, self._select_cache,
+                      self._insert_sql_cache):
+            cache.clear()
+        _like_clause.cache_clear()
+        self.table_map_cache = None
+        self._clear_data_caches()
+        self.drop_search_indexes()
+
     # ------------------------------------------------------------------
     # Table / column metadata
     # ------------------------------------------------------------------
@@ -76,14 +248,54 @@ class DatabaseManager:
             Uses schema_cache for performance. This method is optimized
             for UI operations that only need column metadata without data.
         """
-        if table_name in self.schema_cache:
-            return self.schema_cache[table_name]
+        if table_name not in self.schema_cache:
+            self._load_table_info(table_name)
+        return self.schema_cache[table_name]
 
+    def get_seek_column(self, table_name):
+        """
+        Return the column keyset pagination can seek on, if the table has one.
+
+        Args:
+            table_name (str): Name of the table
+
+        Returns:
+            str or None: The single-column primary key if it is an INTEGER
+            PRIMARY KEY or declared NOT NULL, otherwise None.
+
+        Notes:
+            Seeking past the last shown value is only exact on a unique
+            column without NULLs: duplicate values at a page boundary would
+            be skipped, and ``< ?`` never returns NULL keys. Any other sort
+            column has to page with OFFSET.
+        """
+        if table_name not in self.schema_cache:
+            self._load_table_info(table_name)
+        return self._seek_col_cache[table_name]
+
+    def _load_table_info(self, table_name):
+        """Cache column names and primary key from one PRAGMA table_info call."""
         cursor = self.conn.cursor()
         cursor.execute(f"PRAGMA table_info([{table_name}])")
-        columns = [col[1] for col in cursor.fetchall()]
+        info = cursor.fetchall()
+        columns = [col[1] for col in info]
         self.schema_cache[table_name] = columns
-        return columns
+        # Declared types containing "INT" give INTEGER affinity in SQLite
+        self._int_cols_cache[table_name] = frozenset(
+            col[1] for col in info if "INT" in (col[2] or "").upper())
+        self._pk_cache[table_name] = next(
+            (col[1] for col in info if col[5] > 0),
+            columns[0] if columns else "ID",
+        )
+        # An INTEGER PRIMARY KEY is the rowid; other primary keys may hold
+        # NULLs unless declared NOT NULL
+        pk_cols = [col for col in info if col[5] > 0]
+        self._seek_col_cache[table_name] = (
+            pk_cols[0][1]
+            if len(pk_cols) == 1 and (
+                (pk_cols[0][2] or "").upper() == "INTEGER" or pk_cols[0][3])
+            else None
+        )
 
     # ------------------------------------------------------------------
     # Foreign key resolution helpers
@@ -92,14 +304,25 @@ class DatabaseManager:
     def _ensure_table_map(self, cursor):
         """Populate table_map_cache if not already loaded."""
         if not self.table_map_cache:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            self.table_map_cache = {r[0].upper(): r[0] for r in cursor.fetchall()}
+            # SQLite's upper() folds ASCII only, which covers the game's
+            # table names and matches str.upper() for them.
+            cursor.execute(
+                "SELECT upper(name), name FROM sqlite_master WHERE type='table'")
+            self.table_map_cache = dict(cursor)
+            # Suffix -> table, filled in reverse priority so that DYN_
+            # beats STA_ beats GAM_ beats a bare table name
+            targets = dict(self.table_map_cache)
+            for prefix in reversed(_FK_TABLE_PREFIXES):
+                for upper, name in self.table_map_cache.items():
+                    if upper.startswith(prefix):
+                        targets[upper[len(prefix):]] = name
+            self._fk_target_map = targets
 
     def _resolve_fk_target(self, suffix):
         """Resolve a foreign key suffix to its target table name.
 
-        Searches for tables matching DYN_Suffix, STA_Suffix, GAM_Suffix,
-        or the raw Suffix.
+        Matches DYN_Suffix, STA_Suffix, GAM_Suffix or the raw Suffix, in
+        that order, through the map precomputed by _ensure_table_map.
 
         Args:
             suffix (str): The part of the FK column name after 'fkID'
@@ -107,29 +330,25 @@ class DatabaseManager:
         Returns:
             str or None: The actual table name if found
         """
-        for candidate in [f"DYN_{suffix}", f"STA_{suffix}", f"GAM_{suffix}", suffix]:
-            if candidate.upper() in self.table_map_cache:
-                return self.table_map_cache[candidate.upper()]
-        return None
+        return self._fk_target_map.get(suffix.upper())
 
-    def _resolve_fk_display(self, cursor, target_table):
+    def _resolve_fk_display(self, target_table):
         """Get primary key and display column for a FK target table.
 
+        Results are cached per target table, reusing the column list and
+        primary key already held in the schema caches.
+
         Args:
-            cursor: SQLite cursor
             target_table (str): Name of the target table
 
         Returns:
             tuple: (primary_key_col, display_col) or (None, None)
         """
-        cursor.execute(f"PRAGMA table_info([{target_table}])")
-        target_info = cursor.fetchall()
-        target_cols = [c[1] for c in target_info]
+        if target_table in self._fk_display_cache:
+            return self._fk_display_cache[target_table]
 
-        target_pk = next(
-            (c[1] for c in target_info if c[5] > 0),
-            target_cols[0] if target_cols else "ID",
-        )
+        target_cols = self.get_columns(target_table)
+        target_pk = self._pk_cache[target_table]
         target_col = next(
             (c for c in _FK_DISPLAY_COLUMNS if c in target_cols),
             None,
@@ -137,7 +356,9 @@ class DatabaseManager:
         if not target_col and len(target_cols) > 1:
             target_col = target_cols[1]
 
-        return (target_pk, target_col) if target_col else (None, None)
+        result = (target_pk, target_col) if target_col else (None, None)
+        self._fk_display_cache[target_table] = result
+        return result
 
     # ------------------------------------------------------------------
     # Search helper
@@ -148,19 +369,183 @@ class DatabaseManager:
         """Build a WHERE clause for searching across all columns.
 
         Args:
-            search_fields (list[str]): SQL expressions to search (e.g.
+            search_fields (Sequence[str]): SQL expressions to search (e.g.
                 ``["[table].[col]", "[_fk1].[name]"]``).
             search_term (str): Term to search for
 
         Returns:
             tuple: (where_sql, params)
         """
-        where_sql = " OR ".join(
-            f"CAST({field} AS TEXT) LIKE ?" for field in search_fields
-        )
+        where_sql = _like_clause(tuple(search_fields))
         params = [f"%{search_term}%"] * len(search_fields)
         return where_sql, params
 
+    def prepare_search(self, table_name, search_term):
+        """Build the TEMP search index for a table if this search can use it.
+
+        Tables with at least SEARCH_INDEX_MIN_ROWS rows get a trigram FTS5
+        table in the connection's TEMP schema, kept in sync by TEMP triggers.
+        Nothing is written to the database file itself, so saved CDBs are
+        unaffected. fetch_data never builds the index itself; the editor
+        calls this once its search debounce fires, so the build only
+        happens for a table that is actually searched, on the first term
+        the index can serve (at least 3 characters, no LIKE wildcards).
+
+        Only one table's index is kept: building one drops any other.
+
+        Args:
+            table_name (str): Name of the table
+            search_term (str): Term about to be searched for
+
+        Returns:
+            str or None: Name of the index table, or None for small tables,
+            terms the index cannot serve, or when FTS5/trigram is
+            unavailable (searches then use LIKE).
+        """
+        self._check_external_writes()
+        if table_name in self._search_index:
+            return self._search_index[table_name]
+        if not search_term or not _can_use_trigram_index(search_term):
+            return None
+
+        fts = None
+        row_count = self.conn.execute(
+            f"SELECT COUNT(*) FROM [{table_name}]").fetchone()[0]
+        if row_count >= SEARCH_INDEX_MIN_ROWS:
+            self.drop_search_indexes()
+            try:
+                fts = self._create_search_index(table_name)
+            except sqlite3.Error:
+                self._drop_search_index(f"_search_{table_name}")
+                fts = None
+        self._search_index[table_name] = fts
+        return fts
+
+    def _create_search_index(self, table_name):
+        """Create and populate the TEMP trigram index for *table_name*."""
+        columns = self.get_columns(table_name)
+        fts = f"_search_{table_name}"
+        fts_cols = ", ".join(f"c{i}" for i in range(len(columns)))
+        base_cols = ", ".join(f"[{c}]" for c in columns)
+        new_vals = ", ".join(f"new.[{c}]" for c in columns)
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE temp.[{fts}] USING fts5({fts_cols}, tokenize='trigram')")
+        cursor.execute(
+            f"INSERT INTO temp.[{fts}](rowid, {fts_cols}) "
+            f"SELECT rowid, {base_cols} FROM main.[{table_name}]")
+        cursor.execute(
+            f"CREATE TEMP TRIGGER [{fts}_ai] AFTER INSERT ON main.[{table_name}] BEGIN "
+            f"INSERT INTO [{fts}](rowid, {fts_cols}) VALUES (new.rowid, {new_vals}); END")
+        cursor.execute(
+            f"CREATE TEMP TRIGGER [{fts}_ad] AFTER DELETE ON main.[{table_name}] BEGIN "
+            f"DELETE FROM [{fts}] WHERE rowid = old.rowid; END")
+        cursor.execute(
+            f"CREATE TEMP TRIGGER [{fts}_au] AFTER UPDATE ON main.[{table_name}] BEGIN "
+            f"DELETE FROM [{fts}] WHERE rowid = old.rowid; "
+            f"INSERT INTO [{fts}](rowid, {fts_cols}) VALUES (new.rowid, {new_vals}); END")
+        return fts
+
+    def _drop_search_index(self, fts):
+        """Drop a TEMP search index and its triggers if they exist."""
+        for suffix in ("_ai", "_ad", "_au"):
+            self.conn.execute(f"DROP TRIGGER IF EXISTS temp.[{fts}{suffix}]")
+        self.conn.execute(f"DROP TABLE IF EXISTS temp.[{fts}]")
+
+    def drop_search_indexes(self):
+        """Drop every TEMP search index and free its memory.
+
+        Also used when another connection changed the file, since the
+        indexes may then be stale.
+        """
+        for fts in self._search_index.values():
+            if fts:
+                self._drop_search_index(fts)
+        self._search_index.clear()
+
+    def _build_search_filter(self, table_name, columns, search_fields, search_term):
+        """Build the WHERE clause for a search, using the trigram index if possible.
+
+        The LIKE chain always decides which rows match. When the table has
+        a search index (see prepare_search), it only narrows the base-table
+        columns to candidate rows first: trigram matching folds case more
+        widely than LIKE and treats ``%``/``_`` literally, so every LIKE
+        match is a candidate but not the other way round. Expressions that
+        are not plain base columns (FK display values in lookup mode) keep
+        a plain LIKE scan.
+
+        Returns:
+            tuple: (where_sql, params)
+        """
+        direct = [i for i, c in enumerate(columns)
+                  if search_fields[i] == f"[{table_name}].[{c}]"]
+
+        self._check_external_writes()
+        if not _could_match_integer(search_term):
+            # The text of an integer holds only digits and '-', so columns
+            # holding nothing but integers cannot match this term and are
+            # left out of the scan.
+            int_cols = self._integer_only_columns(table_name)
+            skipped = {i for i in direct if columns[i] in int_cols}
+            if skipped:
+                direct = [i for i in direct if i not in skipped]
+                search_fields = [f for i, f in enumerate(search_fields)
+                                 if i not in skipped]
+                if not search_fields:
+                    return "0", []
+
+        fts = None
+        if _can_use_trigram_index(search_term):
+            fts = self._search_index.get(table_name)
+        if not fts or not direct:
+            return self._build_search_clause(search_fields, search_term)
+
+        direct_exprs = {f"[{table_name}].[{columns[i]}]" for i in direct}
+        like_sql, params = self._build_search_clause(
+            [f for f in search_fields if f in direct_exprs], search_term)
+        phrase = '"' + search_term.replace('"', '""') + '"'
+        column_filter = " ".join(f"c{i}" for i in direct)
+        clauses = [
+            f"([{table_name}].rowid IN "
+            f"(SELECT rowid FROM temp.[{fts}] WHERE [{fts}] MATCH ?) "
+            f"AND ({like_sql}))"
+        ]
+        params = [f"{{{column_filter}}} : {phrase}", *params]
+
+        others = [f for f in search_fields if f not in direct_exprs]
+        if others:
+            like_sql, like_params = self._build_search_clause(others, search_term)
+            clauses.append(like_sql)
+            params.extend(like_params)
+        return " OR ".join(clauses), params
+
+    def _integer_only_columns(self, table_name):
+        """Return the declared-INTEGER columns that hold only integers.
+
+        INTEGER affinity does not stop REAL or TEXT values from being
+        stored, so each candidate column is checked against the data once
+        (one scan per table) and the result cached until the table is
+        written to.
+
+        Returns:
+            frozenset[str]: Columns whose non-NULL values are all integers
+        """
+        int_cols = self._int_only_cache.get(table_name)
+        if int_cols is None:
+            candidates = sorted(self._int_cols_cache[table_name])
+            int_cols = frozenset()
+            if candidates:
+                checks = ", ".join(
+                    f"sum(typeof([{c}]) NOT IN ('integer', 'null'))"
+                    for c in candidates)
+                row = self.conn.execute(
+                    f"SELECT {checks} FROM [{table_name}]").fetchone()
+                int_cols = frozenset(
+                    c for c, others in zip(candidates, row) if not others)
+            self._int_only_cache[table_name] = int_cols
+        return int_cols
+
     def _build_lookup_joins(self, cursor, table_name, columns):
         """Build SELECT fields and JOINs for FK lookup mode.
 
@@ -168,32 +553,71 @@ class DatabaseManager:
             tuple: (select_fields, joins) where select_fields[i] is the
             SQL expression for column i and joins is a list of JOIN clauses.
         """
-        self._ensure_table_map(cursor)
         select_fields = [f"[{table_name}].[{c}]" for c in columns]
         joins = []
-        for i, col in enumerate(columns):
-            if col.startswith("fkID") and len(col) > 4:
-                target_table = self._resolve_fk_target(col[4:])
-                if target_table:
-                    try:
-                        pk, display = self._resolve_fk_display(cursor, target_table)
-                        if display:
-                            alias = f"_fk{i}"
-                            select_fields[i] = f"[{alias}].[{display}]"
-                            joins.append(
-                                f"LEFT JOIN [{target_table}] [{alias}] "
-                                f"ON [{alias}].[{pk}] = [{table_name}].[{col}]"
-                            )
-                    except Exception:
-                        pass
+        for i, col, target_table, pk, display in self._fk_plan(cursor, table_name, columns):
+            alias = f"_fk{i}"
+            select_fields[i] = f"[{alias}].[{display}]"
+            joins.append(
+                f"LEFT JOIN [{target_table}] [{alias}] "
+                f"ON [{alias}].[{pk}] = [{table_name}].[{col}]"
+            )
         return select_fields, joins
 
+    def _resolve_fk_column(self, cursor, fk_column):
+        """Resolve an fkID* column to its target table and display column.
+
+        Memoized per column name, since the same fkID column appears in
+        many tables and resolution only depends on the schema.
+
+        Returns:
+            tuple or None: (target_table, pk, display), or None if the
+            column is not a resolvable foreign key.
+        """
+        if fk_column in self._fk_resolution_cache:
+            return self._fk_resolution_cache[fk_column]
+
+        resolved = None
+        if fk_column.startswith("fkID") and len(fk_column) > 4:
+            self._ensure_table_map(cursor)
+            target_table = self._resolve_fk_target(fk_column[4:])
+            if target_table:
+                try:
+                    pk, display = self._resolve_fk_display(target_table)
+                    if display:
+                        resolved = (target_table, pk, display)
+                except Exception:
+                    pass
+        self._fk_resolution_cache[fk_column] = resolved
+        return resolved
+
+    def _fk_plan(self, cursor, table_name, columns):
+        """Return the resolvable FK columns of a table, computed once per table.
+
+        Returns:
+            list[tuple]: (col_index, col_name, target_table, pk, display)
+            for every fkID* column whose target table and display column
+            could be resolved.
+        """
+        plan = self._fk_plan_cache.get(table_name)
+        if plan is not None:
+            return plan
+
+        plan = []
+        for i, col in enumerate(columns):
+            resolved = self._resolve_fk_column(cursor, col)
+            if resolved:
+                plan.append((i, col, *resolved))
+        self._fk_plan_cache[table_name] = plan
+        return plan
+
     # ------------------------------------------------------------------
     # Data fetching
     # ------------------------------------------------------------------
 
     def fetch_data(self, table_name, search_term=None, lookup=False,
-                   limit=None, offset=0, sort_col=None, sort_reverse=False):
+                   limit=None, offset=0, sort_col=None, sort_reverse=False,
+                   after_key=None):
         """
         Fetch data from a table with optional filtering, lookup, sorting, and pagination.
 
@@ -205,38 +629,131 @@ class DatabaseManager:
             offset (int, optional): Number of rows to skip (for pagination).
             sort_col (str, optional): Column name to sort by.
             sort_reverse (bool, optional): If True, sort descending.
+            after_key (optional): sort_col value of the last row already
+                shown. Rows are then sought past it through the index
+                (keyset pagination) instead of skipped with OFFSET, so
+                sort_col must be the table's get_seek_column().
 
         Returns:
             tuple: (columns, rows) where columns is list[str] and rows is list[tuple]
+
+        Raises:
+            ValueError: If sort_col is not a column of the table, or
+                after_key is given without sorting on the seek column.
         """
         cursor = self.conn.cursor()
+        columns, sql, params = self._build_fetch_sql(
+            cursor, table_name, search_term, lookup, sort_col, sort_reverse,
+            after_key)
 
-        columns = self.get_columns(table_name)
-        select_fields = [f"[{table_name}].[{c}]" for c in columns]
-        joins = []
+        if limit is not None:
+            # Bound rather than interpolated so every page of the same view
+            # shares one SQL string and hits the prepared-statement cache.
+            sql += " LIMIT ? OFFSET ?"
+            params = [*params, limit, offset]
+
+        cursor.execute(sql, params)
+        return columns, cursor.fetchall()
+
+    def fetch_data_with_count(self, table_name, search_term=None, lookup=False,
+                              limit=None, offset=0, sort_col=None,
+                              sort_reverse=False):
+        """
+        Fetch one page together with the total number of matching rows.
 
-        if lookup:
-            select_fields, joins = self._build_lookup_joins(
-                cursor, table_name, columns)
+        Takes the same arguments as fetch_data. The total is computed by
+        ``COUNT(*) OVER()`` in the same statement, so a filtered view is
+        scanned once instead of once for the count and once for the page.
 
-        query_cols = ", ".join(select_fields)
-        join_clause = " ".join(joins)
-        sql = f"SELECT {query_cols} FROM [{table_name}] {join_clause}"
+        Returns:
+            tuple: (columns, rows, total)
+
+        Raises:
+            ValueError: If sort_col is not a column of the table.
+        """
+        cursor = self.conn.cursor()
+        columns, sql, params = self._build_fetch_sql(
+            cursor, table_name, search_term, lookup, sort_col, sort_reverse,
+            with_total=True)
+
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = [*params, limit, offset]
+
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        if not rows:
+            # An empty page carries no total; only then count separately.
+            return columns, rows, (
+                self.get_row_count(table_name, search_term, lookup) if offset else 0)
+        total = rows[0][-1]
+        return columns, [row[:-1] for row in rows], total
+
+    def _build_fetch_sql(self, cursor, table_name, search_term, lookup,
+                         sort_col, sort_reverse, after_key=None,
+                         with_total=False):
+        """Assemble the SELECT shared by the fetch_data* methods.
+
+        Returns:
+            tuple: (columns, sql, params) without any LIMIT/OFFSET clause.
+            With with_total, each row ends with an extra COUNT(*) OVER()
+            value.
+        """
+        columns, select_fields, from_sql = self._select_parts(
+            cursor, table_name, lookup)
+        select_list = ", ".join(select_fields)
+        if with_total:
+            select_list += ", COUNT(*) OVER()"
+        sql = f"SELECT {select_list} {from_sql}"
+        conditions = []
         params = []
 
+        if sort_col and sort_col not in columns:
+            # Identifiers cannot be bound, so only known columns are spliced in.
+            raise ValueError(f"Unknown sort column for {table_name}: {sort_col}")
+
         if search_term:
-            where_sql, params = self._build_search_clause(
-                select_fields, search_term)
-            sql += f" WHERE {where_sql}"
+            where_sql, params = self._build_search_filter(
+                table_name, columns, select_fields, search_term)
+            conditions.append(f"({where_sql})")
+
+        if after_key is not None:
+            if not sort_col or sort_col != self.get_seek_column(table_name):
+                raise ValueError(
+                    f"after_key requires sorting on the seek column of {table_name}")
+            conditions.append(
+                f"[{table_name}].[{sort_col}] {'<' if sort_reverse else '>'} ?")
+            params = [*params, after_key]
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
 
         if sort_col:
             sql += f" ORDER BY [{table_name}].[{sort_col}] {'DESC' if sort_reverse else 'ASC'}"
 
-        if limit is not None:
-            sql += f" LIMIT {limit} OFFSET {offset}"
+        return columns, sql, params
 
-        cursor.execute(sql, params)
-        return columns, cursor.fetchall()
+    def _select_parts(self, cursor, table_name, lookup):
+        """Return the cached column list, SELECT fields and FROM clause.
+
+        Returns:
+            tuple: (columns, select_fields, from_sql) for the table in the
+            given lookup mode.
+        """
+        key = (table_name, lookup)
+        parts = self._select_cache.get(key)
+        if parts is None:
+            columns = self.get_columns(table_name)
+            if lookup:
+                select_fields, joins = self._build_lookup_joins(
+                    cursor, table_name, columns)
+            else:
+                select_fields = [f"[{table_name}].[{c}]" for c in columns]
+                joins = []
+            from_sql = " ".join([f"FROM [{table_name}]", *joins])
+            parts = (columns, tuple(select_fields), from_sql)
+            self._select_cache[key] = parts
+        return parts
 
     def get_row_count(self, table_name, search_term=None, lookup=False):
         """
@@ -249,25 +766,65 @@ class DatabaseManager:
 
         Returns:
             int: Number of rows matching the criteria
+
+        Notes:
+            Unfiltered counts are cached per table until this connection
+            writes to the table or another connection changes the file.
         """
         cursor = self.conn.cursor()
         if search_term:
-            columns = self.get_columns(table_name)
-            search_fields = [f"[{table_name}].[{c}]" for c in columns]
-            joins = []
-            if lookup:
-                search_fields, joins = self._build_lookup_joins(
-                    cursor, table_name, columns)
-            join_clause = " ".join(joins)
-            where_sql, params = self._build_search_clause(
-                search_fields, search_term)
+            columns, search_fields, from_sql = self._select_parts(
+                cursor, table_name, lookup)
+            where_sql, params = self._build_search_filter(
+                table_name, columns, search_fields, search_term)
             cursor.execute(
-                f"SELECT COUNT(*) FROM [{table_name}] {join_clause} WHERE {where_sql}",
-                params,
-            )
-        else:
+                f"SELECT COUNT(*) {from_sql} WHERE {where_sql}", params)
+            return cursor.fetchone()[0]
+
+        self._check_external_writes()
+        count = self._row_count_cache.get(table_name)
+        if count is None:
             cursor.execute(f"SELECT COUNT(*) FROM [{table_name}]")
-        return cursor.fetchone()[0]
+            count = cursor.fetchone()[0]
+            self._row_count_cache[table_name] = count
+        return count
+
+    # ------------------------------------------------------------------
+    # Transactions
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several write calls into a single transaction.
+
+        Usage::
+
+            with db.batch():
+                db.update_cell(...)
+                db.insert_row(...)
+
+        The outermost block opens the transaction with BEGIN IMMEDIATE, so
+        the write lock is taken up front rather than upgraded mid-way, and
+        commits once on exit or rolls back if it raises. Every write method
+        runs inside its own batch(), so nested blocks join the outermost
+        transaction.
+        """
+        if not self._batch_depth:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.conn.rollback()
+                # Caches may have been refilled from uncommitted rows
+                self._clear_data_caches()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.conn.commit()
 
     # ------------------------------------------------------------------
     # Single-row operations
@@ -318,15 +875,15 @@ class DatabaseManager:
             dict: Mapping of pk_val -> tuple of row values
         """
         result = {}
+        cursor = self.conn.cursor()
         for i in range(0, len(pk_vals), DB_CHUNK_SIZE):
             chunk = pk_vals[i:i + DB_CHUNK_SIZE]
             placeholders = ", ".join(["?"] * len(chunk))
-            cursor = self.conn.cursor()
             cursor.execute(
                 f"SELECT * FROM [{table}] WHERE [{pk_col}] IN ({placeholders})",
                 chunk,
             )
-            for row in cursor.fetchall():
+            for row in cursor:
                 result[row[0]] = row
         return result
 
@@ -341,12 +898,12 @@ class DatabaseManager:
             pk_col (str): Primary key column name
             pk_val: Primary key value identifying the row
         """
-        self.conn.execute(
-            f"UPDATE [{table}] SET [{column}]=? WHERE [{pk_col}]=?",
-            (value, pk_val),
-        )
-        self.conn.commit()
-        self._fk_options_cache.clear()
+        with self.batch():
+            self.conn.execute(
+                f"UPDATE [{table}] SET [{column}]=? WHERE [{pk_col}]=?",
+                (value, pk_val),
+            )
+        self._after_write(table)
 
     def delete_row(self, table, pk_col, pk_val):
         """
@@ -357,9 +914,9 @@ class DatabaseManager:
             pk_col (str): Primary key column name
             pk_val: Primary key value identifying the row to delete
         """
-        self.conn.execute(f"DELETE FROM [{table}] WHERE [{pk_col}]=?", (pk_val,))
-        self.conn.commit()
-        self._fk_options_cache.clear()
+        with self.batch():
+            self.conn.execute(f"DELETE FROM [{table}] WHERE [{pk_col}]=?", (pk_val,))
+        self._after_write(table)
 
     def delete_rows(self, table, pk_col, pk_vals):
         """
@@ -370,15 +927,27 @@ class DatabaseManager:
             pk_col (str): Primary key column name
             pk_vals (list): List of primary key values to delete
         """
-        for i in range(0, len(pk_vals), DB_CHUNK_SIZE):
-            chunk = pk_vals[i:i + DB_CHUNK_SIZE]
-            placeholders = ", ".join(["?"] * len(chunk))
-            self.conn.execute(
-                f"DELETE FROM [{table}] WHERE [{pk_col}] IN ({placeholders})",
-                chunk,
-            )
-        self.conn.commit()
-        self._fk_options_cache.clear()
+        cursor = self.conn.cursor()
+        with self.batch():
+            for i in range(0, len(pk_vals), DB_CHUNK_SIZE):
+                chunk = pk_vals[i:i + DB_CHUNK_SIZE]
+                placeholders = ", ".join(["?"] * len(chunk))
+                cursor.execute(
+                    f"DELETE FROM [{table}] WHERE [{pk_col}] IN ({placeholders})",
+                    chunk,
+                )
+        self._after_write(table)
+
+    def _insert_sql(self, table, columns):
+        """Return the memoized INSERT statement for a table/column set."""
+        key = (table, tuple(columns))
+        sql = self._insert_sql_cache.get(key)
+        if sql is None:
+            col_names = ", ".join(f"[{c}]" for c in columns)
+            placeholders = ", ".join(["?"] * len(columns))
+            sql = f"INSERT INTO [{table}] ({col_names}) VALUES ({placeholders})"
+            self._insert_sql_cache[key] = sql
+        return sql
 
     def insert_row(self, table, columns, values):
         """
@@ -389,14 +958,22 @@ class DatabaseManager:
             columns (list[str]): List of column names
             values (list): List of values corresponding to columns
         """
-        placeholders = ", ".join(["?"] * len(values))
-        col_names = ", ".join(f"[{c}]" for c in columns)
-        self.conn.execute(
-            f"INSERT INTO [{table}] ({col_names}) VALUES ({placeholders})",
-            values,
-        )
-        self.conn.commit()
-        self._fk_options_cache.clear()
+        with self.batch():
+            self.conn.execute(self._insert_sql(table, columns), values)
+        self._after_write(table)
+
+    def insert_rows(self, table, columns, rows):
+        """
+        Insert many rows with the same column set in a single transaction.
+
+        Args:
+            table (str): Table name
+            columns (list[str]): List of column names
+            rows (list[list]): Row values, each ordered like columns
+        """
+        with self.batch():
+            self.conn.executemany(self._insert_sql(table, columns), rows)
+        self._after_write(table)
 
     # ------------------------------------------------------------------
     # Foreign key dropdown options
@@ -409,6 +986,42 @@ class DatabaseManager:
         else:
             self._fk_options_cache.clear()
 
+    def _after_write(self, table):
+        """Drop caches derived from *table* after this connection wrote to it."""
+        self._row_count_cache.pop(table, None)
+        self._int_only_cache.pop(table, None)
+        self._invalidate_fk_target(table)
+
+    def _clear_data_caches(self):
+        """Drop every cache derived from table contents."""
+        self._row_count_cache.clear()
+        self._int_only_cache.clear()
+        self._fk_options_cache.clear()
+
+    def _invalidate_fk_target(self, table):
+        """Drop cached FK options whose values are read from *table*."""
+        stale = [col for col, (target, _) in self._fk_options_cache.items()
+                 if target == table]
+        for col in stale:
+            del self._fk_options_cache[col]
+
+    def _read_data_version(self):
+        """Return SQLite's data_version counter for this connection."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_external_writes(self):
+        """Clear derived caches if another connection changed the file.
+
+        ``PRAGMA data_version`` only moves when a *different* connection
+        commits (e.g. a CSV import), so our own writes never trigger this;
+        they are handled precisely by _after_write.
+        """
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._clear_data_caches()
+            self.drop_search_indexes()
+
     def get_fk_options(self, fk_column):
         """
         Get dropdown options for a foreign key column.
@@ -422,31 +1035,27 @@ class DatabaseManager:
         if not fk_column.startswith("fkID") or len(fk_column) <= 4:
             return None
 
+        self._check_external_writes()
         if fk_column in self._fk_options_cache:
-            return self._fk_options_cache[fk_column]
+            return self._fk_options_cache[fk_column][1]
 
         cursor = self.conn.cursor()
-        self._ensure_table_map(cursor)
-
-        target_table = self._resolve_fk_target(fk_column[4:])
-        if not target_table:
+        resolved = self._resolve_fk_column(cursor, fk_column)
+        if not resolved:
             return None
+        target_table, pk, display = resolved
 
         try:
-            pk, display = self._resolve_fk_display(cursor, target_table)
-            if display:
-                cursor.execute(
-                    f"SELECT [{display}], [{pk}] FROM [{target_table}] "
-                    f"ORDER BY [{display}]"
-                )
-                result = {
-                    str(row[0]): row[1]
-                    for row in cursor.fetchall()
-                    if row[0] is not None
-                }
-                self._fk_options_cache[fk_column] = result
-                return result
+            cursor.execute(
+                f"SELECT [{display}], [{pk}] FROM [{target_table}] "
+                f"ORDER BY [{display}]"
+            )
+            result = {
+                str(display_val): pk_val
+                for display_val, pk_val in cursor
+                if display_val is not None
+            }
         except Exception:
-            pass
-
-        return None
+            return None
+        self._fk_options_cache[fk_column] = (target_table, result)
+        return result
@@ -8,29 +8,85 @@ PCM-compatible XML output.
 
 import csv
 import os
+import pathlib
 import re
 import shutil
 import sqlite3
 import tempfile
 import unicodedata
+from contextlib import closing
+from functools import lru_cache
 
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
 
-from core.constants import DB_CHUNK_SIZE
+from core.db_manager import drop_fk_indexes
+
+# lxml's C parser is several times faster than the pure-Python one; it is
+# optional, so fall back to html.parser when it is not installed.
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Site-specific parsers only look at these subtrees, so the rest of the page
+# is never built into a tree. FirstCycling needs its rider tables plus links
+# (for site detection); PCS needs only its startlist list.
+_FIRSTCYCLING_STRAINER = SoupStrainer(['a', 'table'])
+_PCS_STRAINER = SoupStrainer('ul', class_='startlist_v4')
 
 
 # ---------------------------------------------------------------------------
 # Text normalisation helpers
 # ---------------------------------------------------------------------------
 
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+_PCS_CATEGORY_RE = re.compile(r'\s*\([^)]*\)\s*$')   # "(WT)" team suffix
+_LEADING_NUM_RE = re.compile(r'^\d+\s*')            # bib number prefix
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Attribute filters for bs4 lookups (substring matches, as bs4 uses search())
+_HREF_FIRSTCYCLING = re.compile(r'firstcycling\.com')
+_HREF_RIDER_PHP = re.compile(r'rider\.php')
+_HREF_RIDER = re.compile(r'rider')
+_CLASS_STARTLIST = re.compile(r'startlist', re.IGNORECASE)
+_CLASS_TEAM = re.compile(r'team', re.IGNORECASE)
+# Opening tags the generic parsers look for; without one they find nothing
+_GENERIC_TAG_RE = re.compile(r'<(?:ul|table|div)\b', re.IGNORECASE)
+
+# CSS selectors for the ProCyclingStats layout, compiled once at import
+_SEL_PCS_ROOT = soupsieve.compile('ul.startlist_v4')
+_SEL_PCS_TEAM_LI = soupsieve.compile('ul.startlist_v4 > li')
+_SEL_PCS_TEAM_A = soupsieve.compile('a.team')
+_SEL_PCS_RIDER = soupsieve.compile('ul > li a[href*="/rider/"]')
+
+
+@lru_cache(maxsize=16384)
 def _normalize(text):
-    """Lowercase, strip accents, and remove non-alphanumeric characters."""
-    text = unicodedata.normalize('NFD', text)
-    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
-    text = re.sub(r'[^a-z0-9 ]', ' ', text.lower())
+    """Lowercase, strip accents, and remove non-alphanumeric characters.
+
+    Memoized: the same team and rider names are normalised again and
+    again while a startlist is matched.
+    """
+    if not text.isascii():
+        # ASCII text is unchanged by NFD and has no combining marks
+        text = unicodedata.normalize('NFD', text)
+        text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+    text = _NON_ALNUM_RE.sub(' ', text.lower())
     return ' '.join(text.split())
 
 
+def _mentions_team(tag):
+    """Return True if 'team' appears in a tag's names, attributes or text.
+
+    Same answer as ``'team' in str(tag).lower()`` without serialising it.
+    """
+    return any(
+        'team' in (node if node.name is None else f"{node.name} {node.attrs}").lower()
+        for node in (tag, *tag.descendants))
+
+
 def _name_similarity(a, b):
     """Score similarity between two normalised name strings (0.0 to 1.0).
 
@@ -61,6 +117,11 @@ def _name_similarity(a, b):
 # Database lookup (reads from the open SQLite database)
 # ===========================================================================
 
+# Columns consulted by matching, the race dropdown and the XML writer
+_TEAM_FIELDS = ('IDteam', 'gene_sz_name', 'gene_sz_shortname')
+_CYCLIST_FIELDS = ('IDcyclist', 'gene_sz_firstname', 'gene_sz_lastname', 'fkIDteam')
+_RACE_FIELDS = ('gene_sz_race_name', 'gene_sz_filename')
+
 class StartlistDatabase:
     """Loads team and cyclist data for ID lookups.
 
@@ -77,13 +138,17 @@ class StartlistDatabase:
         self.cyclists = cyclists or []
         self.races = races or []
         self._team_index = {}
+        self._team_names = []
         self._cyclist_by_last = {}
+        self._cyclist_by_name = {}
         self._build_indexes()
 
     def _build_indexes(self):
         """Pre-build normalised lookup indexes."""
         self._team_index = {}
+        self._team_names = []
         self._cyclist_by_last = {}
+        self._cyclist_by_name = {}
 
         for t in self.teams:
             tid = t.get('IDteam')
@@ -91,6 +156,7 @@ class StartlistDatabase:
                 val = t.get(key, '')
                 if val:
                     norm = _normalize(str(val))
+                    self._team_names.append((tid, norm))
                     if norm:
                         self._team_index[norm] = tid
 
@@ -99,37 +165,46 @@ class StartlistDatabase:
             if last:
                 norm = _normalize(str(last))
                 self._cyclist_by_last.setdefault(norm, []).append(c)
+                first = _normalize(str(c.get('gene_sz_firstname', '')))
+                self._cyclist_by_name.setdefault((norm, first), []).append(c)
 
     @classmethod
     def from_sqlite(cls, db_path):
-        """Load from a SQLite database (converted CDB)."""
+        """Load from a SQLite database (converted CDB).
+
+        The file is opened read-only so loading never takes a write lock
+        that would stall the editor's own connection.
+        """
         teams, cyclists, races = [], [], []
         try:
-            with sqlite3.connect(db_path) as conn:
+            uri = pathlib.Path(db_path).resolve().as_uri() + "?mode=ro"
+            with closing(sqlite3.connect(uri, uri=True)) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
 
-                cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' "
-                    "AND name IN ('DYN_team', 'DYN_cyclist', 'STA_race')"
-                )
-                existing = {row[0] for row in cursor.fetchall()}
-
-                if 'DYN_team' in existing:
-                    cursor.execute("SELECT * FROM [DYN_team]")
-                    teams = [dict(row) for row in cursor.fetchall()]
-
-                if 'DYN_cyclist' in existing:
-                    cursor.execute("SELECT * FROM [DYN_cyclist]")
-                    cyclists = [dict(row) for row in cursor.fetchall()]
-
-                if 'STA_race' in existing:
-                    cursor.execute("SELECT * FROM [STA_race]")
-                    races = [dict(row) for row in cursor.fetchall()]
+                teams = cls._select_fields(cursor, 'DYN_team', _TEAM_FIELDS)
+                cyclists = cls._select_fields(cursor, 'DYN_cyclist', _CYCLIST_FIELDS)
+                races = cls._select_fields(cursor, 'STA_race', _RACE_FIELDS)
         except Exception:
             pass
         return cls(teams, cyclists, races)
 
+    @staticmethod
+    def _select_fields(cursor, table, fields):
+        """Read only the given columns of a table as a list of dicts.
+
+        Columns missing from this database version are skipped; a missing
+        table yields an empty list.
+        """
+        cursor.execute(f"PRAGMA table_info([{table}])")
+        present = {row[1] for row in cursor.fetchall()}
+        columns = [f for f in fields if f in present]
+        if not columns:
+            return []
+        cursor.execute(
+            f"SELECT {', '.join(f'[{c}]' for c in columns)} FROM [{table}]")
+        return [dict(row) for row in cursor]
+
     @classmethod
     def from_csv_folder(cls, folder):
         """Load from a folder containing DYN_team.csv, DYN_cyclist.csv, etc."""
@@ -165,14 +240,11 @@ class StartlistDatabase:
             return self._team_index[norm], name
 
         best_score, best_id = 0.0, None
-        for t in self.teams:
-            for key in ('gene_sz_name', 'gene_sz_shortname'):
-                val = t.get(key, '')
-                if val:
-                    score = _name_similarity(norm, _normalize(str(val)))
-                    if score > best_score:
-                        best_score = score
-                        best_id = t.get('IDteam')
+        for tid, team_norm in self._team_names:
+            score = _name_similarity(norm, team_norm)
+            if score > best_score:
+                best_score = score
+                best_id = tid
 
         if best_score >= 0.5:
             return best_id, name
@@ -197,11 +269,19 @@ class StartlistDatabase:
         last_norm_alt = _normalize(parts[-1])
         first_norm_alt = _normalize(' '.join(parts[:-1]))
 
+        exact_last = last_norm
         candidates = list(self._cyclist_by_last.get(last_norm, []))
         if not candidates:
             candidates = list(self._cyclist_by_last.get(last_norm_alt, []))
             if candidates:
                 first_norm = first_norm_alt
+                exact_last = last_norm_alt
+
+        # An exact first + last name hit (on the right team, if given)
+        # already has the best possible score, so skip the partial scan
+        for c in self._cyclist_by_name.get((exact_last, first_norm), ()):
+            if not team_id or str(c.get('fkIDteam', '')) == str(team_id):
+                return c.get('IDcyclist'), self._rider_display(c)
 
         # Also include partial last name matches (handles hyphenated /
         # double-barrelled surnames like "Martin-Guyonnet" vs "Martin")
@@ -230,11 +310,15 @@ class StartlistDatabase:
 
         best = max(candidates, key=score)
         if score(best) > 0:
-            display = f"{best.get('gene_sz_firstname', '')} {best.get('gene_sz_lastname', '')}"
-            return best.get('IDcyclist'), display
+            return best.get('IDcyclist'), self._rider_display(best)
 
         return None, None
 
+    @staticmethod
+    def _rider_display(c):
+        """Return "Firstname Lastname" for a cyclist row."""
+        return f"{c.get('gene_sz_firstname', '')} {c.get('gene_sz_lastname', '')}"
+
 
 # ===========================================================================
 # HTML Parsing
@@ -261,19 +345,35 @@ class StartlistParser:
             return None
 
     def _parse_html(self, html_content):
-        """Route HTML to the correct site-specific or generic parser."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        """Route HTML to the correct site-specific or generic parser.
 
-        if self._is_firstcycling(soup):
-            result = self._parse_firstcycling(soup)
-            if result:
-                return result
-
-        if self._is_procyclingstats(soup):
-            result = self._parse_procyclingstats(soup)
-            if result:
-                return result
+        Site-specific parsers run on strained soups holding only the
+        elements they inspect; the markup is only parsed for a site when
+        its marker text occurs at all. The full tree is built only if the
+        generic strategies are needed and the markup holds a tag they read.
+        """
+        if 'firstcycling.com' in html_content:
+            soup = BeautifulSoup(html_content, _HTML_PARSER,
+                                 parse_only=_FIRSTCYCLING_STRAINER)
+            if self._is_firstcycling(soup):
+                result = self._parse_firstcycling(soup)
+                if result:
+                    return result
+
+        if 'startlist_v4' in html_content:
+            soup = BeautifulSoup(html_content, _HTML_PARSER,
+                                 parse_only=_PCS_STRAINER)
+            if self._is_procyclingstats(soup):
+                result = self._parse_procyclingstats(soup)
+                if result:
+                    return result
+
+        # Not worth a full parse if there is no element the generic
+        # strategies could read (a text dump, an unrelated file, ...)
+        if not _GENERIC_TAG_RE.search(html_content):
+            return None
 
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
         for strategy in [
             self._parse_startlist_lists,
             self._parse_tables,
@@ -290,7 +390,7 @@ class StartlistParser:
     @staticmethod
     def _is_firstcycling(soup):
         """Check if HTML is from FirstCycling."""
-        return bool(soup.find('a', href=lambda x: x and 'firstcycling.com' in x))
+        return bool(soup.find('a', href=_HREF_FIRSTCYCLING))
 
     @staticmethod
     def _parse_firstcycling(soup):
@@ -312,7 +412,7 @@ class StartlistParser:
 
             riders = []
             for row in table.find_all('tr'):
-                link = row.find('a', href=lambda x: x and 'rider.php' in x)
+                link = row.find('a', href=_HREF_RIDER_PHP)
                 if link:
                     name = link.get('title', '').strip() or link.get_text(strip=True)
                     if name:
@@ -328,7 +428,7 @@ class StartlistParser:
     @staticmethod
     def _is_procyclingstats(soup):
         """Check if HTML is from ProCyclingStats."""
-        return bool(soup.select_one('ul.startlist_v4'))
+        return bool(_SEL_PCS_ROOT.select_one(soup))
 
     @staticmethod
     def _parse_procyclingstats(soup):
@@ -344,18 +444,18 @@ class StartlistParser:
         """
         startlist = {}
 
-        for team_li in soup.select('ul.startlist_v4 > li'):
-            team_link = team_li.select_one('a.team')
+        for team_li in _SEL_PCS_TEAM_LI.select(soup):
+            team_link = _SEL_PCS_TEAM_A.select_one(team_li)
             if not team_link:
                 continue
             team_name = team_link.get_text(strip=True)
             # Strip category suffix: (WT), (PRT), (CT), etc.
-            team_name = re.sub(r'\s*\([^)]*\)\s*$', '', team_name).strip()
+            team_name = _PCS_CATEGORY_RE.sub('', team_name).strip()
             if not team_name:
                 continue
 
             riders = []
-            for rider_link in team_li.select('ul > li a[href*="/rider/"]'):
+            for rider_link in _SEL_PCS_RIDER.select(team_li):
                 raw = rider_link.get_text(strip=True)
                 if not raw:
                     continue
@@ -368,6 +468,7 @@ class StartlistParser:
         return startlist or None
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _pcs_name_to_first_last(pcs_name):
         """Convert PCS 'LASTNAME Firstname' to 'Firstname LASTNAME'.
 
@@ -382,8 +483,11 @@ class StartlistParser:
         # Find the first non-uppercase word (= start of first name)
         first_idx = len(parts)
         for i, word in enumerate(parts):
-            has_alpha = any(c.isalpha() for c in word)
-            if has_alpha and not word.isupper():
+            if word.isupper():
+                continue  # surname words, the common case
+            # A lowercase letter makes it a name word; otherwise only
+            # uncased letters (or none at all) are present
+            if word != word.upper() or any(c.isalpha() for c in word):
                 first_idx = i
                 break
 
@@ -400,7 +504,7 @@ class StartlistParser:
     @staticmethod
     def _parse_startlist_lists(soup):
         """Fallback parser: extract teams from <ul> elements with 'startlist' class."""
-        teams = soup.find_all('ul', class_=lambda x: x and 'startlist' in x.lower())
+        teams = soup.find_all('ul', class_=_CLASS_STARTLIST)
         if not teams:
             return None
 
@@ -415,8 +519,8 @@ class StartlistParser:
 
             riders = []
             for li in team_ul.find_all('li'):
-                name = re.sub(r'^\d+\s*', '', li.get_text(strip=True))
-                name = re.sub(r'\s+', ' ', name)
+                name = _LEADING_NUM_RE.sub('', li.get_text(strip=True))
+                name = _WHITESPACE_RE.sub(' ', name)
                 if len(name) > 2:
                     riders.append(name)
 
@@ -439,7 +543,7 @@ class StartlistParser:
                 if not cells:
                     continue
 
-                if 'team' in str(row).lower() or len(cells) == 1:
+                if len(cells) == 1 or _mentions_team(row):
                     if current_team and current_riders:
                         startlist[current_team] = current_riders
                     current_team = cells[0].get_text(strip=True)
@@ -448,7 +552,7 @@ class StartlistParser:
                     for cell in cells:
                         name = cell.get_text(strip=True)
                         if name and len(name) > 2:
-                            current_riders.append(re.sub(r'^\d+\s*', '', name))
+                            current_riders.append(_LEADING_NUM_RE.sub('', name))
                             break
 
             if current_team and current_riders:
@@ -461,7 +565,7 @@ class StartlistParser:
         """Fallback parser: extract teams from <div> elements with 'team' class."""
         startlist = {}
 
-        for div in soup.find_all('div', class_=lambda x: x and 'team' in x.lower()):
+        for div in soup.find_all('div', class_=_CLASS_TEAM):
             header = div.find(['h3', 'h4', 'h5', 'strong'])
             if not header:
                 continue
@@ -469,7 +573,7 @@ class StartlistParser:
 
             riders = [
                 a.get_text(strip=True)
-                for a in div.find_all('a', href=lambda x: x and 'rider' in x)
+                for a in div.find_all('a', href=_HREF_RIDER)
             ]
 
             if riders:
@@ -482,6 +586,11 @@ class StartlistParser:
 # XML Writer
 # ===========================================================================
 
+# Fixed element templates, bound once so per-rider formatting is a C call
+_XML_TEAM_OPEN = '    <team id="{}">\n'.format
+_XML_CYCLIST = '        <cyclist id="{}" />\n'.format
+
+
 class PCMXmlWriter:
     """Writes parsed startlist data to PCM-compatible XML."""
 
@@ -512,44 +621,55 @@ class PCMXmlWriter:
         total_riders = sum(len(r) for r in startlist_data.values())
         processed = 0
 
-        lines = ['<startlist>']
-
-        for team_name, riders in startlist_data.items():
-            team_id = None
-            if db:
-                team_id, _ = db.match_team(team_name)
-            if team_id:
-                log(f"  [TEAM]  {team_name} -> ID {team_id}")
-            else:
-                team_id = str(fallback_team_id)
-                fallback_team_id += 1
-                unmatched_teams.append(team_name)
-                log(f"  [TEAM]  {team_name} -> NOT FOUND (using {team_id})")
-
-            lines.append(f'    <team id="{team_id}">')
-
-            for rider_name in riders:
-                rider_id = None
-                if db:
-                    rider_id, matched = db.match_rider(rider_name, team_id)
-                if rider_id:
-                    log(f"    [RIDER] {rider_name} -> ID {rider_id}")
-                    lines.append(f'        <cyclist id="{rider_id}" />')
-                else:
-                    unmatched_riders.append(rider_name)
-                    log(f"    [RIDER] {rider_name} -> SKIPPED (not in database)")
-
-                processed += 1
-                if on_progress:
-                    on_progress(processed, total_riders)
-
-            lines.append('    </team>')
-
-        lines.append('</startlist>')
-        lines.append('')  # trailing newline
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        # Stream into a temporary file next to the target and only then
+        # replace it, so a failure part-way never leaves a truncated file
+        # (or clobbers a good one)
+        temp_file = output_file + ".tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.write('<startlist>\n')
+
+                for team_name, riders in startlist_data.items():
+                    team_id = None
+                    if db:
+                        team_id, _ = db.match_team(team_name)
+                    if team_id:
+                        team_log = [f"  [TEAM]  {team_name} -> ID {team_id}"]
+                    else:
+                        team_id = str(fallback_team_id)
+                        fallback_team_id += 1
+                        unmatched_teams.append(team_name)
+                        team_log = [f"  [TEAM]  {team_name} -> NOT FOUND (using {team_id})"]
+
+                    rider_ids = []
+                    for rider_name in riders:
+                        rider_id = None
+                        if db:
+                            rider_id, matched = db.match_rider(rider_name, team_id)
+                        if rider_id:
+                            team_log.append(f"    [RIDER] {rider_name} -> ID {rider_id}")
+                            rider_ids.append(rider_id)
+                        else:
+                            unmatched_riders.append(rider_name)
+                            team_log.append(f"    [RIDER] {rider_name} -> SKIPPED (not in database)")
+
+                    f.write(_XML_TEAM_OPEN(team_id))
+                    f.write(''.join(map(_XML_CYCLIST, rider_ids)))
+                    f.write('    </team>\n')
+
+                    # Log and report progress once per team: each call may
+                    # redraw the UI, which costs far more than the matching
+                    log("\n".join(team_log))
+                    processed += len(riders)
+                    if on_progress:
+                        on_progress(processed, total_riders)
+
+                f.write('</startlist>\n')
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        os.replace(temp_file, output_file)
 
         if unmatched_teams:
             log(f"\n[!] {len(unmatched_teams)} team(s) not matched: "
@@ -567,6 +687,16 @@ class PCMXmlWriter:
 
 FREE_AGENT_TEAM_ID = 119
 
+# The multiplayer copy is a throwaway temp file that is rebuilt on every run,
+# so it can skip the on-disk journal and fsyncs
+_SCRATCH_DB_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA cache_size=-65536",
+)
+
 
 def apply_multiplayer_startlist(db_path, team_ids, rider_ids):
     """Create a modified database where non-startlist riders are moved out.
@@ -575,6 +705,10 @@ def apply_multiplayer_startlist(db_path, team_ids, rider_ids):
     in *rider_ids*, set ``fkIDteam`` to 119 (free-agent pool).  Riders on
     teams not in the startlist are left untouched.
 
+    The editor's helper indexes (see db_manager.ensure_fk_indexes) are
+    dropped from the copy: the source may be a reused working copy that
+    still carries them, and the copy is converted back into a game CDB.
+
     Args:
         db_path:   Path to the source SQLite database.
         team_ids:  Set/collection of matched team ID strings.
@@ -589,50 +723,46 @@ def apply_multiplayer_startlist(db_path, team_ids, rider_ids):
     if os.path.exists(working):
         os.remove(working)
     shutil.copy2(db_path, working)
+    drop_fk_indexes(working)
 
     team_list = [str(t) for t in team_ids if t is not None]
     rider_list = [str(r) for r in rider_ids if r is not None]
 
-    with sqlite3.connect(working) as conn:
+    # One explicit transaction for both statements, and the connection is
+    # closed afterwards (sqlite3's own context manager only commits)
+    with closing(sqlite3.connect(working, isolation_level=None)) as conn:
         cursor = conn.cursor()
+        for pragma in _SCRATCH_DB_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Load both ID sets into TEMP tables so each statement is a single
+        # anti-join instead of a chain of chunked NOT IN (...) lists. The
+        # columns are untyped so values compare exactly as bound parameters.
+        cursor.execute("CREATE TEMP TABLE _mp_teams (id PRIMARY KEY)")
+        cursor.execute("CREATE TEMP TABLE _mp_riders (id PRIMARY KEY)")
+        cursor.executemany(
+            "INSERT OR IGNORE INTO _mp_teams VALUES (?)", ((t,) for t in team_list))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO _mp_riders VALUES (?)", ((r,) for r in rider_list))
 
-        # Build the WHERE clause with chunked IN parameters
         # fkIDteam IN (participating teams) AND IDcyclist NOT IN (startlist)
-        team_placeholders = ", ".join("?" * len(team_list))
-        query = (
-            f"UPDATE [DYN_cyclist] SET fkIDteam = ? "
-            f"WHERE fkIDteam IN ({team_placeholders})"
+        cursor.execute(
+            "UPDATE [DYN_cyclist] SET fkIDteam = ? "
+            "WHERE fkIDteam IN (SELECT id FROM _mp_teams) "
+            "AND IDcyclist NOT IN (SELECT id FROM _mp_riders)",
+            (FREE_AGENT_TEAM_ID,),
         )
-        params = [FREE_AGENT_TEAM_ID] + team_list
-
-        if rider_list:
-            # Chunk the rider exclusion list to stay within SQLite limits
-            for i in range(0, len(rider_list), DB_CHUNK_SIZE):
-                chunk = rider_list[i:i + DB_CHUNK_SIZE]
-                rider_placeholders = ", ".join("?" * len(chunk))
-                query += f" AND IDcyclist NOT IN ({rider_placeholders})"
-                params.extend(chunk)
-
-        cursor.execute(query, params)
         moved = cursor.rowcount
 
         # Clear contracts for the moved riders (same WHERE logic)
-        del_query = (
-            f"DELETE FROM [DYN_contract_cyclist] "
-            f"WHERE fkIDteam IN ({team_placeholders})"
+        cursor.execute(
+            "DELETE FROM [DYN_contract_cyclist] "
+            "WHERE fkIDteam IN (SELECT id FROM _mp_teams) "
+            "AND fkIDcyclist NOT IN (SELECT id FROM _mp_riders)"
         )
-        del_params = list(team_list)
-
-        if rider_list:
-            for i in range(0, len(rider_list), DB_CHUNK_SIZE):
-                chunk = rider_list[i:i + DB_CHUNK_SIZE]
-                rp = ", ".join("?" * len(chunk))
-                del_query += f" AND fkIDcyclist NOT IN ({rp})"
-                del_params.extend(chunk)
-
-        cursor.execute(del_query, del_params)
         contracts_removed = cursor.rowcount
 
-        conn.commit()
+        cursor.execute("COMMIT")
 
     return working, moved, contracts_removed
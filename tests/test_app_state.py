@@ -43,6 +43,36 @@ class TestAppState(unittest.TestCase):
         self.assertEqual(state2.settings["window_size"], "1200x800")
         self.assertTrue(state2.settings["lookup_mode"])
 
+    def test_save_settings_leaves_no_temp_file(self):
+        """Test that saving replaces the settings file atomically."""
+        self.state.save_settings("1200x800", False, False)
+
+        self.assertFalse(os.path.exists(self.temp_file.name + ".tmp"))
+        with open(self.temp_file.name, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["window_size"], "1200x800")
+
+    def test_save_settings_skips_unchanged(self):
+        """Test that an unchanged save does not rewrite the file."""
+        self.state.save_settings("1200x800", False, False)
+        os.remove(self.temp_file.name)
+
+        self.state.save_settings("1200x800", False, False)
+        self.assertFalse(os.path.exists(self.temp_file.name))
+
+        self.state.favorites.append("DYN_team")
+        self.state.save_settings("1200x800", False, False)
+        self.assertTrue(os.path.exists(self.temp_file.name))
+
+    def test_loaded_settings_are_independent(self):
+        """Test that cached settings are not shared between instances."""
+        self.state.favorites = ["DYN_team"]
+        self.state.save_settings("1200x800", False, False)
+
+        state2 = AppState(self.temp_file.name)
+        state3 = AppState(self.temp_file.name)
+        state2.favorites.append("DYN_cyclist")
+        self.assertEqual(state3.favorites, ["DYN_team"])
+
     def test_add_recent(self):
         """Test adding recent files with limit of 10."""
         # Add 12 files
@@ -54,6 +84,16 @@ class TestAppState(unittest.TestCase):
         # Most recent should be first
         self.assertEqual(self.state.recents[0], "file11.cdb")
 
+    def test_add_recent_moves_existing_to_front(self):
+        """Test re-adding a recent file moves it to the front without duplicates."""
+        for name in ("a.cdb", "b.cdb", "c.cdb"):
+            self.state.add_recent(name)
+        self.state.add_recent("a.cdb")
+        self.assertEqual(self.state.recents, ["a.cdb", "c.cdb", "b.cdb"])
+
+        self.state.remove_recent("c.cdb")
+        self.assertEqual(self.state.recents, ["a.cdb", "b.cdb"])
+
     def test_undo_redo(self):
         """Test undo/redo stack operations."""
         # Push an action
@@ -62,13 +102,13 @@ class TestAppState(unittest.TestCase):
         # Undo should return the action
         action = self.state.undo()
         self.assertIsNotNone(action)
-        self.assertEqual(action["old"], "Old Name")
-        self.assertEqual(action["new"], "New Name")
+        self.assertEqual(action.old, "Old Name")
+        self.assertEqual(action.new, "New Name")
 
         # Redo should return it again
         action = self.state.redo()
         self.assertIsNotNone(action)
-        self.assertEqual(action["new"], "New Name")
+        self.assertEqual(action.new, "New Name")
 
     def test_push_undo_clears_redo(self):
         """Test that new edits clear redo stack."""
@@ -92,8 +132,8 @@ class TestAppState(unittest.TestCase):
         # Most recent action should be preserved (last pushed)
         latest = self.state.undo_stack[-1]
         expected_idx = MAX_UNDO_STACK_SIZE + 19
-        self.assertEqual(latest["old"], f"old{expected_idx}")
-        self.assertEqual(latest["new"], f"new{expected_idx}")
+        self.assertEqual(latest.old, f"old{expected_idx}")
+        self.assertEqual(latest.new, f"new{expected_idx}")
 
     def test_undo_stack_limit_with_push_action(self):
         """Test that push_action also respects the undo stack limit."""
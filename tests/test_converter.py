@@ -32,11 +32,14 @@ class TestConverter(unittest.TestCase):
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir, ignore_errors=True)
 
+    @patch('core.converter.stamp_working_db')
     @patch('core.converter.subprocess.run')
     @patch('core.converter.os.path.exists')
     @patch('core.converter.os.remove')
     @patch('core.converter.shutil.move')
-    def test_export_cdb_to_sqlite_success(self, mock_move, mock_remove, mock_exists, mock_run):
+    @patch('core.converter.shutil.copyfile')
+    def test_export_cdb_to_sqlite_success(self, mock_copyfile, mock_move, mock_remove,
+                                          mock_exists, mock_run, mock_stamp):
         """Test successful CDB to SQLite conversion."""
         # Mock TOOL_PATH and temp file exist
         mock_exists.return_value = True
@@ -51,7 +54,9 @@ class TestConverter(unittest.TestCase):
         mock_run.assert_called_once()
         args = mock_run.call_args[0][0]
         self.assertIn("-export", args)
-        self.assertIn(os.path.abspath(self.cdb_path), args)
+        # Exporter runs on a scratch copy of the CDB in the temp directory
+        self.assertEqual(os.path.basename(args[-1]), "test.cdb")
+        self.assertTrue(args[-1].startswith(tempfile.gettempdir()))
 
         # Verify file move was attempted
         mock_move.assert_called_once()
@@ -59,6 +64,60 @@ class TestConverter(unittest.TestCase):
         # Verify return value
         self.assertIn("pcm_working_db.sqlite", result)
 
+    @patch('core.converter.os.path.exists')
+    @patch('core.converter.subprocess.run')
+    def test_export_cdb_to_sqlite_reuses_untouched_working_copy(self, mock_run, mock_exists):
+        """Test that re-opening an unchanged CDB reuses an unedited working copy."""
+        mock_exists.side_effect = lambda p: p == converter.TOOL_PATH or os.path.isfile(p)
+
+        def fake_export(args, **kwargs):
+            sqlite_path = os.path.splitext(args[-1])[0] + ".sqlite"
+            with open(sqlite_path, 'w') as f:
+                f.write("exported")
+            return MagicMock(returncode=0)
+
+        mock_run.side_effect = fake_export
+        with patch('core.converter.tempfile.gettempdir', return_value=self.temp_dir):
+            first = converter.export_cdb_to_sqlite(self.cdb_path)
+            self.assertEqual(os.path.dirname(first), self.temp_dir)
+            second = converter.export_cdb_to_sqlite(self.cdb_path)
+            self.assertEqual(second, first)
+            self.assertEqual(mock_run.call_count, 1)
+
+            # Writes that do not change the data are re-stamped and ignored
+            with open(first, 'a') as f:
+                f.write(" + helper indexes")
+            converter.stamp_working_db(first, self.cdb_path)
+            converter.export_cdb_to_sqlite(self.cdb_path)
+            self.assertEqual(mock_run.call_count, 1)
+
+            # Unsaved edits in the working copy force a fresh export
+            with open(first, 'w') as f:
+                f.write("edited")
+            third = converter.export_cdb_to_sqlite(self.cdb_path)
+            self.assertEqual(mock_run.call_count, 2)
+            with open(third) as f:
+                self.assertEqual(f.read(), "exported")
+
+    @patch('core.converter.os.path.exists')
+    @patch('core.converter.subprocess.run')
+    def test_export_cdb_to_sqlite_reexports_changed_cdb(self, mock_run, mock_exists):
+        """Test that a CDB modified since the export is converted again."""
+        mock_exists.side_effect = lambda p: p == converter.TOOL_PATH or os.path.isfile(p)
+
+        def fake_export(args, **kwargs):
+            with open(os.path.splitext(args[-1])[0] + ".sqlite", 'w') as f:
+                f.write("exported")
+            return MagicMock(returncode=0)
+
+        mock_run.side_effect = fake_export
+        with patch('core.converter.tempfile.gettempdir', return_value=self.temp_dir):
+            converter.export_cdb_to_sqlite(self.cdb_path)
+            with open(self.cdb_path, 'a') as f:
+                f.write(" saved by the game")
+            converter.export_cdb_to_sqlite(self.cdb_path)
+        self.assertEqual(mock_run.call_count, 2)
+
     @patch('core.converter.subprocess.run')
     @patch('core.converter.os.path.exists')
     def test_export_cdb_to_sqlite_tool_not_found(self, mock_exists, mock_run):
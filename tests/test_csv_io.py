@@ -9,7 +9,10 @@ import os
 import tempfile
 import sqlite3
 import csv
-from core.csv_io import export_table, import_table_from_csv, export_to_csv, import_from_csv
+from core.csv_io import (
+    export_table, import_table_from_csv, import_tables_from_csv,
+    export_to_csv, import_from_csv,
+)
 
 
 class TestCsvIO(unittest.TestCase):
@@ -97,6 +100,22 @@ class TestCsvIO(unittest.TestCase):
         self.assertEqual(rows[0], (10, 'ImportedItem1', 1000))
         self.assertEqual(rows[1], (20, 'ImportedItem2', 2000))
 
+    def test_import_table_from_csv_rolls_back_on_error(self):
+        """Test that a failed import leaves existing rows untouched."""
+        csv_path = os.path.join(self.csv_dir, "bad_columns.csv")
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'missing_column'])
+            writer.writerow([10, 'x'])
+
+        with self.assertRaises(sqlite3.OperationalError):
+            import_table_from_csv(self.db_file.name, "test_table", csv_path)
+
+        conn = sqlite3.connect(self.db_file.name)
+        count = conn.execute("SELECT COUNT(*) FROM test_table").fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 3)
+
     def test_export_to_csv_all_tables(self):
         """Test exporting all tables to CSV folder."""
         # Add another table
@@ -141,6 +160,31 @@ class TestCsvIO(unittest.TestCase):
         self.assertEqual(len(rows), 1)
         self.assertEqual(rows[0], (99, 'NewItem', 9900))
 
+    def test_import_tables_from_csv(self):
+        """Test importing several tables in one batch."""
+        conn = sqlite3.connect(self.db_file.name)
+        conn.execute("CREATE TABLE other_table (id INTEGER, data TEXT)")
+        conn.commit()
+        conn.close()
+
+        first = os.path.join(self.csv_dir, "first.csv")
+        second = os.path.join(self.csv_dir, "second.csv")
+        with open(first, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows([['id', 'name', 'value'], [5, 'Five', 500]])
+        with open(second, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows([['id', 'data'], [1, 'a'], [2, 'b']])
+
+        import_tables_from_csv(
+            self.db_file.name,
+            [("test_table", first), ("other_table", second)],
+        )
+
+        conn = sqlite3.connect(self.db_file.name)
+        self.assertEqual(conn.execute("SELECT * FROM test_table").fetchall(),
+                         [(5, 'Five', 500)])
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM other_table").fetchone()[0], 2)
+        conn.close()
+
     def test_csv_utf8_encoding(self):
         """Test CSV export/import with UTF-8 characters."""
         # Add row with UTF-8 characters
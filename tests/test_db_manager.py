@@ -8,7 +8,11 @@ import unittest
 import sqlite3
 import tempfile
 import os
-from core.db_manager import DatabaseManager
+import threading
+from unittest.mock import patch
+from core.db_manager import (
+    DatabaseManager, _like_clause, drop_fk_indexes, ensure_fk_indexes,
+)
 
 
 class TestDatabaseManager(unittest.TestCase):
@@ -66,6 +70,25 @@ class TestDatabaseManager(unittest.TestCase):
         count = self.db.get_row_count("test_table")
         self.assertEqual(count, 2)
 
+    def test_row_count_cache_invalidation(self):
+        """Test cached row counts follow own writes, rollbacks and external writes."""
+        self.assertEqual(self.db.get_row_count("test_table"), 2)
+        self.db.insert_row("test_table", ["id", "name", "value"], [3, "Item3", 300])
+        self.assertEqual(self.db.get_row_count("test_table"), 3)
+
+        with self.assertRaises(RuntimeError):
+            with self.db.batch():
+                self.db.delete_row("test_table", "id", 3)
+                self.assertEqual(self.db.get_row_count("test_table"), 2)
+                raise RuntimeError("abort")
+        self.assertEqual(self.db.get_row_count("test_table"), 3)
+
+        other = sqlite3.connect(self.db_file.name)
+        other.execute("DELETE FROM test_table")
+        other.commit()
+        other.close()
+        self.assertEqual(self.db.get_row_count("test_table"), 0)
+
     def test_update_cell(self):
         """Test updating a cell value."""
         self.db.update_cell("test_table", "name", "Updated", "id", 1)
@@ -111,6 +134,18 @@ class TestDatabaseManager(unittest.TestCase):
         columns, rows = self.db.fetch_data("test_table", search_term="NonExistent")
         self.assertEqual(len(rows), 0)
 
+    def test_search_skips_integer_columns_for_text_terms(self):
+        """Test integer columns are only scanned when the term could match them."""
+        statements = []
+        self.db.conn.set_trace_callback(statements.append)
+        self.assertEqual(self.db.get_row_count("test_table", search_term="Item"), 2)
+        self.assertEqual(self.db.get_row_count("test_table", search_term="20"), 1)
+        self.db.conn.set_trace_callback(None)
+
+        counts = [s for s in statements if s.startswith("SELECT COUNT") and "WHERE" in s]
+        self.assertNotIn("[value]", counts[0])
+        self.assertIn("[value]", counts[1])
+
     def test_pagination(self):
         """Test pagination with limit and offset."""
         # Add more rows for pagination testing
@@ -131,6 +166,59 @@ class TestDatabaseManager(unittest.TestCase):
         columns, rows = self.db.fetch_data("test_table", limit=2, offset=10)
         self.assertEqual(len(rows), 0)
 
+    def test_keyset_pagination(self):
+        """Test after_key seeks past the last shown key in both directions."""
+        self.db.insert_rows("test_table", ["id", "name", "value"],
+                            [[3, "Item3", 300], [4, "Item4", 400]])
+        _, rows = self.db.fetch_data("test_table", limit=2, sort_col="id", after_key=2)
+        self.assertEqual([r[0] for r in rows], [3, 4])
+        _, rows = self.db.fetch_data("test_table", search_term="Item", limit=2,
+                                     sort_col="id", sort_reverse=True, after_key=3)
+        self.assertEqual([r[0] for r in rows], [2, 1])
+        with self.assertRaises(ValueError):
+            self.db.fetch_data("test_table", limit=2, after_key=2)
+        with self.assertRaises(ValueError):
+            self.db.fetch_data("test_table", limit=2, sort_col="value", after_key=100)
+
+    def test_seek_column_requires_unique_non_null_key(self):
+        """Test keyset pagination is only offered on a unique non-NULL key."""
+        conn = sqlite3.connect(self.db_file.name)
+        conn.executescript("""
+            CREATE TABLE text_key (code TEXT PRIMARY KEY, name TEXT);
+            CREATE TABLE strict_key (code TEXT NOT NULL PRIMARY KEY, name TEXT);
+            CREATE TABLE pair_key (a INTEGER, b INTEGER, PRIMARY KEY (a, b));
+            CREATE TABLE no_key (id INTEGER, name TEXT);
+            INSERT INTO text_key VALUES ('b', 'B'), (NULL, 'null key'), ('a', 'A');
+        """)
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(self.db.get_seek_column("test_table"), "id")
+        self.assertEqual(self.db.get_seek_column("strict_key"), "code")
+        for table in ("text_key", "pair_key", "no_key"):
+            self.assertIsNone(self.db.get_seek_column(table))
+
+        # A nullable key pages with OFFSET, which keeps the NULL row
+        _, rows = self.db.fetch_data("text_key", limit=2, offset=2,
+                                     sort_col="code", sort_reverse=True)
+        self.assertEqual(rows, [(None, "null key")])
+        with self.assertRaises(ValueError):
+            self.db.fetch_data("text_key", limit=2, sort_col="code",
+                               sort_reverse=True, after_key="a")
+
+    def test_fetch_data_with_count(self):
+        """Test page and total come back from a single query."""
+        self.db.insert_row("test_table", ["id", "name", "value"], [3, "Other", 300])
+        columns, rows, total = self.db.fetch_data_with_count(
+            "test_table", search_term="Item", limit=1, sort_col="id")
+        self.assertEqual(columns, ["id", "name", "value"])
+        self.assertEqual(rows, [(1, "Item1", 100)])
+        self.assertEqual(total, 2)
+
+        _, rows, total = self.db.fetch_data_with_count(
+            "test_table", search_term="Item", limit=1, offset=5)
+        self.assertEqual((rows, total), ([], 2))
+
     def test_sorting(self):
         """Test sorting by column."""
         # Sort by name ascending
@@ -148,6 +236,11 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(rows[0][2], 100)
         self.assertEqual(rows[1][2], 200)
 
+    def test_sorting_rejects_unknown_column(self):
+        """Test sort columns are validated before being spliced into SQL."""
+        with self.assertRaises(ValueError):
+            self.db.fetch_data("test_table", sort_col="name]; DROP TABLE test_table; --")
+
     def test_delete_rows_bulk(self):
         """Test bulk deletion of multiple rows."""
         # Add more rows
@@ -172,6 +265,16 @@ class TestDatabaseManager(unittest.TestCase):
         max_id = self.db.get_max_id("test_table", "id")
         self.assertEqual(max_id, 1)  # Should be 1 for empty table
 
+    def test_get_max_id_ignores_autoincrement_sequence(self):
+        """Test next ID follows live rows, not sqlite_sequence, after deletes."""
+        self.db.conn.execute(
+            "CREATE TABLE seq_table (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT)")
+        self.db.conn.executemany(
+            "INSERT INTO seq_table (name) VALUES (?)", [("a",), ("b",), ("c",)])
+        self.db.conn.commit()
+        self.db.delete_row("seq_table", "id", 3)
+        self.assertEqual(self.db.get_max_id("seq_table", "id"), 3)
+
     def test_get_row_data(self):
         """Test fetching specific row by primary key."""
         row = self.db.get_row_data("test_table", "id", 1)
@@ -236,5 +339,258 @@ class TestDatabaseManager(unittest.TestCase):
         self.db.invalidate_fk_cache("fkIDsomething")
 
 
+    def _create_fk_tables(self):
+        """Add a DYN_team table and a table referencing it via fkIDteam."""
+        self.db.conn.executescript("""
+            CREATE TABLE DYN_team (IDteam INTEGER PRIMARY KEY, gene_sz_name TEXT);
+            INSERT INTO DYN_team VALUES (1, 'Alpha'), (2, 'Beta');
+            CREATE TABLE DYN_rider (IDrider INTEGER PRIMARY KEY, fkIDteam INTEGER);
+            INSERT INTO DYN_rider VALUES (10, 1), (11, 2);
+        """)
+
+    def test_fk_options_invalidated_only_by_target_writes(self):
+        """Test that FK options survive unrelated writes but not target writes."""
+        self._create_fk_tables()
+        options = self.db.get_fk_options("fkIDteam")
+        self.assertEqual(options, {"Alpha": 1, "Beta": 2})
+
+        self.db.update_cell("test_table", "name", "Other", "id", 1)
+        self.assertIn("fkIDteam", self.db._fk_options_cache)
+
+        self.db.update_cell("DYN_team", "gene_sz_name", "Gamma", "IDteam", 2)
+        self.assertNotIn("fkIDteam", self.db._fk_options_cache)
+        self.assertEqual(self.db.get_fk_options("fkIDteam"), {"Alpha": 1, "Gamma": 2})
+
+    def test_fk_resolution_cached_until_reset(self):
+        """Test FK resolution is memoized per column and cleared by reset_caches."""
+        # Resolve before the target exists: the miss is cached too
+        self.assertIsNone(self.db.get_fk_options("fkIDteam"))
+        self._create_fk_tables()
+        self.assertIsNone(self.db.get_fk_options("fkIDteam"))
+
+        self.db.reset_caches()
+        self.assertEqual(self.db.get_fk_options("fkIDteam"), {"Alpha": 1, "Beta": 2})
+        self.assertEqual(self.db._fk_resolution_cache["fkIDteam"],
+                         ("DYN_team", "IDteam", "gene_sz_name"))
+
+    def test_reset_caches_after_schema_change(self):
+        """Test reset_caches drops every cache built from the old columns."""
+        self.db.insert_row("test_table", ["id", "name", "value"], [3, "Item3", 300])
+        self.db.fetch_data("test_table", search_term="Item")
+        self.assertTrue(self.db._insert_sql_cache)
+
+        other = sqlite3.connect(self.db_file.name)
+        other.execute("ALTER TABLE test_table ADD COLUMN extra TEXT")
+        other.commit()
+        other.close()
+        self.assertEqual(self.db.get_columns("test_table"), ["id", "name", "value"])
+
+        self.db.reset_caches()
+        self.assertEqual(self.db._insert_sql_cache, {})
+        self.assertEqual(_like_clause.cache_info().currsize, 0)
+        columns, rows = self.db.fetch_data("test_table", search_term="Item3")
+        self.assertEqual(columns, ["id", "name", "value", "extra"])
+        self.assertEqual(rows, [(3, "Item3", 300, None)])
+
+    def test_fk_options_invalidated_by_external_write(self):
+        """Test that commits from another connection refresh FK options."""
+        self._create_fk_tables()
+        self.db.get_fk_options("fkIDteam")
+
+        other = sqlite3.connect(self.db_file.name)
+        other.execute("UPDATE DYN_team SET gene_sz_name = 'Delta' WHERE IDteam = 1")
+        other.commit()
+        other.close()
+
+        self.assertEqual(self.db.get_fk_options("fkIDteam"), {"Beta": 2, "Delta": 1})
+
+
+    def test_lookup_mode_uses_joins(self):
+        """Test that lookup mode resolves FKs through LEFT JOINs, not subqueries."""
+        self._create_fk_tables()
+        columns, rows = self.db.fetch_data("DYN_rider", lookup=True)
+        self.assertEqual(columns, ["IDrider", "fkIDteam"])
+        self.assertEqual(rows, [(10, "Alpha"), (11, "Beta")])
+
+        select_fields, joins = self.db._build_lookup_joins(
+            self.db.conn.cursor(), "DYN_rider", columns)
+        plan = self.db.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT {', '.join(select_fields)} "
+            f"FROM [DYN_rider] {' '.join(joins)}"
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        self.assertNotIn("CORRELATED", details)
+        self.assertIn("PRIMARY KEY", details)
+
+
+    def test_fk_indexes_created_and_dropped(self):
+        """Test helper indexes on fkID columns can be added and removed."""
+        self._create_fk_tables()
+
+        def helper_indexes():
+            return [row[0] for row in self.db.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' "
+                "AND tbl_name='DYN_rider'")]
+
+        # Built on a worker thread, as the editor's load and save tasks do,
+        # while the manager's own connection stays on this thread
+        worker = threading.Thread(target=ensure_fk_indexes, args=(self.db_file.name,))
+        worker.start()
+        worker.join()
+        self.assertEqual(helper_indexes(), ["pcmtools_fk_DYN_rider_fkIDteam"])
+        self.assertEqual(self.db.get_fk_options("fkIDteam"), {"Alpha": 1, "Beta": 2})
+
+        drop_fk_indexes(self.db_file.name)
+        self.assertEqual(helper_indexes(), [])
+
+    def test_opening_does_not_create_fk_indexes(self):
+        """Test the constructor leaves the database file untouched."""
+        self._create_fk_tables()
+        before = os.stat(self.db_file.name).st_mtime_ns
+        other = DatabaseManager(self.db_file.name)
+        try:
+            names = [row[0] for row in other.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'")]
+        finally:
+            other.conn.close()
+        self.assertFalse([n for n in names if n.startswith("pcmtools_fk_")])
+        self.assertEqual(os.stat(self.db_file.name).st_mtime_ns, before)
+
+
+    def test_insert_rows(self):
+        """Test bulk insert helper."""
+        self.db.insert_rows("test_table", ["id", "name", "value"],
+                            [[3, "Item3", 300], [4, "Item4", 400]])
+        _, rows = self.db.fetch_data("test_table")
+        self.assertEqual(rows, [(1, "Item1", 100), (2, "Item2", 200),
+                                (3, "Item3", 300), (4, "Item4", 400)])
+
+    def test_batch_rolls_back_on_error(self):
+        """Test that a failing batch discards all of its writes."""
+        with self.assertRaises(RuntimeError):
+            with self.db.batch():
+                self.db.update_cell("test_table", "name", "Changed", "id", 1)
+                self.db.delete_row("test_table", "id", 2)
+                raise RuntimeError("abort")
+
+        _, rows = self.db.fetch_data("test_table")
+        self.assertEqual(rows, [(1, "Item1", 100), (2, "Item2", 200)])
+
+    def test_writes_commit_without_leaving_transaction_open(self):
+        """Test each write commits on its own and batch() holds the write lock."""
+        self.db.delete_rows("test_table", "id", [1])
+        self.assertFalse(self.db.conn.in_transaction)
+
+        other = sqlite3.connect(self.db_file.name, timeout=0)
+        try:
+            with self.db.batch():
+                self.db.update_cell("test_table", "name", "Locked", "id", 2)
+                with self.assertRaises(sqlite3.OperationalError):
+                    other.execute("BEGIN IMMEDIATE")
+            self.assertEqual(
+                other.execute("SELECT name FROM test_table").fetchall(), [("Locked",)])
+        finally:
+            other.close()
+
+    @patch('core.db_manager.SEARCH_INDEX_MIN_ROWS', 1)
+    def test_search_uses_trigram_index(self):
+        """Test indexed search matches LIKE semantics and tracks edits."""
+        if not self.db.prepare_search("test_table", "tem2"):
+            self.skipTest("SQLite build lacks FTS5 trigram tokenizer")
+        _, rows = self.db.fetch_data("test_table", search_term="tem2")
+        self.assertEqual(rows, [(2, 'Item2', 200)])
+        self.assertEqual(self.db.get_row_count("test_table", search_term="Item"), 2)
+
+        # Edits through the connection keep the index in sync
+        self.db.update_cell("test_table", "name", "Renamed", "id", 2)
+        self.db.insert_row("test_table", ["id", "name", "value"], [3, "Item3", 300])
+        _, rows = self.db.fetch_data("test_table", search_term="item")
+        self.assertEqual([r[0] for r in rows], [1, 3])
+
+        # Writes from another connection invalidate the index
+        other = sqlite3.connect(self.db_file.name)
+        other.execute("UPDATE test_table SET name = 'Outside' WHERE id = 1")
+        other.commit()
+        other.close()
+        self.assertEqual(self.db.get_row_count("test_table", search_term="Outside"), 1)
+
+    @patch('core.db_manager.SEARCH_INDEX_MIN_ROWS', 1)
+    def test_indexed_search_matches_unindexed_results(self):
+        """Test the trigram index never changes which rows a search returns."""
+        self.db.insert_rows("test_table", ["id", "name", "value"], [
+            [3, "ÉVANS", 300], [4, "50%_off", 400], [5, "50 off", 500]])
+        terms = ["éva", "ÉVA", "eva", "%_o", "0%_", "_of", "tem", "ITEM1", "50 "]
+        expected = {t: self.db.fetch_data("test_table", search_term=t)[1]
+                    for t in terms}
+        if not self.db.prepare_search("test_table", "tem"):
+            self.skipTest("SQLite build lacks FTS5 trigram tokenizer")
+        for term in terms:
+            self.assertEqual(
+                self.db.fetch_data("test_table", search_term=term)[1],
+                expected[term], term)
+        self.assertEqual(expected["éva"], [])
+        self.assertEqual([r[0] for r in expected["%_o"]], [4, 5])  # LIKE wildcards
+
+    def test_search_does_not_build_index(self):
+        """Test fetch_data never builds the index itself."""
+        with patch('core.db_manager.SEARCH_INDEX_MIN_ROWS', 1):
+            self.db.fetch_data("test_table", search_term="Item")
+        self.assertNotIn("test_table", self.db._search_index)
+
+    @patch('core.db_manager.SEARCH_INDEX_MIN_ROWS', 1)
+    def test_prepare_search_is_lazy_and_keeps_one_index(self):
+        """Test the index is only built for usable terms, one table at a time."""
+        self._create_fk_tables()
+        for term in ("", "It", "%te", "I_e"):
+            self.assertIsNone(self.db.prepare_search("test_table", term), term)
+        self.assertNotIn("test_table", self.db._search_index)
+
+        if not self.db.prepare_search("test_table", "Item"):
+            self.skipTest("SQLite build lacks FTS5 trigram tokenizer")
+        self.assertTrue(self.db.prepare_search("DYN_rider", "Beta"))
+        self.assertEqual(list(self.db._search_index), ["DYN_rider"])
+        temp_tables = {r[0] for r in self.db.conn.execute(
+            "SELECT name FROM sqlite_temp_master WHERE type = 'table'")}
+        self.assertNotIn("_search_test_table", temp_tables)
+        _, rows = self.db.fetch_data("test_table", search_term="Item2")
+        self.assertEqual([r[0] for r in rows], [2])
+
+        self.db.drop_search_indexes()
+        self.assertEqual(self.db._search_index, {})
+
+    @patch('core.db_manager.SEARCH_INDEX_MIN_ROWS', 1)
+    def test_indexed_search_in_lookup_mode(self):
+        """Test indexed search still matches FK display values in lookup mode."""
+        self._create_fk_tables()
+        self.db.prepare_search("DYN_rider", "Beta")
+        _, rows = self.db.fetch_data("DYN_rider", search_term="Beta", lookup=True)
+        self.assertEqual(rows, [(11, "Beta")])
+        _, rows = self.db.fetch_data("DYN_rider", search_term="Beta")
+        self.assertEqual(rows, [])
+
+    def test_search_keeps_integer_columns_holding_other_values(self):
+        """Test INTEGER columns holding REAL or TEXT values are still searched."""
+        self.assertEqual(self.db.get_row_count("test_table", search_term="abc"), 0)
+        self.db.insert_rows("test_table", ["id", "name", "value"], [
+            [3, "Item3", 1.5], [4, "Item4", "abc"]])
+        _, rows = self.db.fetch_data("test_table", search_term="1.5")
+        self.assertEqual([r[0] for r in rows], [3])
+        _, rows = self.db.fetch_data("test_table", search_term="abc")
+        self.assertEqual([r[0] for r in rows], [4])
+
+        # Cleaning the column up lets it be skipped again
+        self.db.delete_rows("test_table", "id", [3, 4])
+        self.assertEqual(self.db._integer_only_columns("test_table"),
+                         frozenset({"id", "value"}))
+
+    def test_pagination_reuses_select_parts(self):
+        """Test paginated fetches reuse the cached SELECT and bind LIMIT/OFFSET."""
+        _, first = self.db.fetch_data("test_table", limit=1, offset=0)
+        _, second = self.db.fetch_data("test_table", limit=1, offset=1)
+        self.assertEqual(first, [(1, 'Item1', 100)])
+        self.assertEqual(second, [(2, 'Item2', 200)])
+        self.assertEqual(list(self.db._select_cache), [("test_table", False)])
+
+
 if __name__ == '__main__':
     unittest.main()
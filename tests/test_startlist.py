@@ -0,0 +1,333 @@
+"""
+Unit tests for core.startlist module.
+
+Run with: python -m unittest tests.test_startlist
+"""
+
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest.mock import MagicMock, patch
+from core import converter
+from core.db_manager import ensure_fk_indexes
+from core.startlist import (
+    PCMXmlWriter, StartlistDatabase, StartlistParser, apply_multiplayer_startlist,
+)
+
+
+FIRSTCYCLING_HTML = """<html><body>
+<a href="https://firstcycling.com/race.php?r=17">Tour de France</a>
+<table class="tablesorter">
+  <thead><tr><th><a href="team.php?l=1">UAE Team Emirates</a></th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td><a href="rider.php?r=1" title="Tadej Pogacar">POGACAR Tadej</a></td></tr>
+    <tr><td>2</td><td><a href="rider.php?r=2">Juan Ayuso</a></td></tr>
+  </tbody>
+</table>
+<table class="tablesorter">
+  <thead><tr><th>Visma | Lease a Bike</th></tr></thead>
+  <tbody><tr><td><a href="rider.php?r=3" title="Jonas Vingegaard">VINGEGAARD</a></td></tr></tbody>
+</table>
+</body></html>"""
+
+PCS_HTML = """<html><body><ul class="startlist_v4">
+  <li><div class="ridersCont">
+    <a class="team" href="/team/uae-team-emirates-2024">UAE Team Emirates (WT)</a>
+    <ul>
+      <li><span class="bib">1</span><a href="/rider/tadej-pogacar">POGAČAR Tadej</a></li>
+      <li><span class="bib">2</span><a href="/rider/juan-ayuso">AYUSO Juan</a></li>
+    </ul>
+  </div></li>
+  <li><div class="ridersCont">
+    <a class="team" href="/team/team-visma-lease-a-bike-2024">Visma | Lease a Bike (WT)</a>
+    <ul><li><a href="/rider/jonas-vingegaard">VINGEGAARD Jonas</a></li></ul>
+  </div></li>
+</ul></body></html>"""
+
+GENERIC_LIST_HTML = """<html><body>
+<h3>UAE Team Emirates</h3>
+<ul class="startlist"><li>1 Tadej   Pogacar</li><li>2 Juan Ayuso</li></ul>
+<h3>Visma | Lease a Bike</h3>
+<ul class="startlist"><li>11 Jonas Vingegaard</li></ul>
+</body></html>"""
+
+TABLE_HTML = """<html><body><table>
+  <tr><th>UAE Team Emirates</th></tr>
+  <tr><td>1</td><td>Tadej Pogacar</td></tr>
+  <tr><td>2</td><td>Juan Ayuso</td></tr>
+  <tr><th>Visma | Lease a Bike</th></tr>
+  <tr><td>11</td><td>Jonas Vingegaard</td></tr>
+</table></body></html>"""
+
+EXPECTED_STARTLIST = {
+    "UAE Team Emirates": ["Tadej Pogacar", "Juan Ayuso"],
+    "Visma | Lease a Bike": ["Jonas Vingegaard"],
+}
+
+
+def _create_game_db(path):
+    """Write a small converted-CDB style database with teams and cyclists."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE DYN_team (IDteam INTEGER PRIMARY KEY, gene_sz_name TEXT,
+                               gene_sz_shortname TEXT);
+        CREATE TABLE DYN_cyclist (IDcyclist INTEGER PRIMARY KEY, gene_sz_firstname TEXT,
+                                  gene_sz_lastname TEXT, fkIDteam INTEGER);
+        INSERT INTO DYN_team VALUES (1, 'UAE Team Emirates', 'UAD'),
+                                    (2, 'Team Visma | Lease a Bike', 'TVL');
+        INSERT INTO DYN_cyclist VALUES (10, 'Tadej', 'Pogačar', 1),
+                                       (11, 'Juan', 'Ayuso Pesquera', 1),
+                                       (20, 'Jonas', 'Vingegaard', 2),
+                                       (21, 'Juan', 'Ayuso', 2);
+    """)
+    conn.commit()
+    conn.close()
+
+
+class _FakeDatabase:
+    """Minimal stand-in for StartlistDatabase with fixed matches."""
+
+    def __init__(self, teams, riders, fail_on=None):
+        self.teams = teams
+        self.riders = riders
+        self.fail_on = fail_on
+
+    def match_team(self, name):
+        return self.teams.get(name), None
+
+    def match_rider(self, name, team_id):
+        if name == self.fail_on:
+            raise RuntimeError("lookup failed")
+        rider_id = self.riders.get(name)
+        return rider_id, name if rider_id else None
+
+
+class TestPCMXmlWriter(unittest.TestCase):
+    """Test suite for PCMXmlWriter output."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.temp_dir, "race.xml")
+        self.messages = []
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_write_matched_and_fallback_ids(self):
+        """Test matched riders are written and unmatched teams get fallback IDs."""
+        data = {"Team A": ["Rider One", "Nobody", "Rider Two"], "Team B": ["Rider Three"]}
+        db = _FakeDatabase({"Team A": 5}, {"Rider One": 1, "Rider Two": 2, "Rider Three": 3})
+        self.assertTrue(PCMXmlWriter.write(data, self.output, db=db, log=self.messages.append))
+
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), (
+                '<startlist>\n'
+                '    <team id="5">\n'
+                '        <cyclist id="1" />\n'
+                '        <cyclist id="2" />\n'
+                '    </team>\n'
+                '    <team id="1000">\n'
+                '        <cyclist id="3" />\n'
+                '    </team>\n'
+                '</startlist>\n'
+            ))
+        self.assertIn("[!] 1 team(s) not matched: Team B", "\n".join(self.messages))
+        self.assertIn("[!] 1 rider(s) not matched: Nobody", "\n".join(self.messages))
+
+    def test_write_empty_data(self):
+        """Test nothing is written when there is no data."""
+        self.assertFalse(PCMXmlWriter.write({}, self.output, log=self.messages.append))
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_failed_write_keeps_existing_file(self):
+        """Test an error part-way leaves the previous output untouched."""
+        with open(self.output, "w", encoding="utf-8") as f:
+            f.write("previous")
+        db = _FakeDatabase({}, {"Rider One": 1}, fail_on="Rider Two")
+
+        with self.assertRaises(RuntimeError):
+            PCMXmlWriter.write({"Team A": ["Rider One", "Rider Two"]}, self.output,
+                               db=db, log=self.messages.append)
+
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "previous")
+        self.assertEqual(os.listdir(self.temp_dir), ["race.xml"])
+
+
+class TestStartlistParser(unittest.TestCase):
+    """Test suite for StartlistParser site and fallback formats."""
+
+    def setUp(self):
+        """Create a parser."""
+        self.parser = StartlistParser()
+
+    def test_parse_firstcycling(self):
+        """Test FirstCycling tables use the team header and rider link titles."""
+        self.assertEqual(self.parser._parse_html(FIRSTCYCLING_HTML), EXPECTED_STARTLIST)
+
+    def test_parse_procyclingstats(self):
+        """Test PCS names are reordered and team category suffixes dropped."""
+        self.assertEqual(self.parser._parse_html(PCS_HTML), {
+            "UAE Team Emirates": ["Tadej POGAČAR", "Juan AYUSO"],
+            "Visma | Lease a Bike": ["Jonas VINGEGAARD"],
+        })
+
+    def test_parse_generic_startlist_lists(self):
+        """Test startlist <ul> elements take their team from the heading."""
+        self.assertEqual(self.parser._parse_html(GENERIC_LIST_HTML), EXPECTED_STARTLIST)
+
+    def test_parse_generic_table(self):
+        """Test single-cell rows start a team and bib numbers are skipped."""
+        self.assertEqual(self.parser._parse_html(TABLE_HTML), EXPECTED_STARTLIST)
+
+    def test_parse_without_startlist(self):
+        """Test markup without any startlist returns None."""
+        self.assertIsNone(self.parser._parse_html("just some text"))
+        self.assertIsNone(self.parser._parse_html("<p>No riders here</p>"))
+
+    def test_parse_file(self):
+        """Test a saved HTML file is read and parsed."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "startlist.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(PCS_HTML)
+            self.assertEqual(list(self.parser.parse_file(path)), list(EXPECTED_STARTLIST))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestStartlistDatabase(unittest.TestCase):
+    """Test suite for StartlistDatabase team and rider matching."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the lookup database from a small SQLite file."""
+        cls.temp_dir = tempfile.mkdtemp()
+        path = os.path.join(cls.temp_dir, "game.sqlite")
+        _create_game_db(path)
+        cls.db = StartlistDatabase.from_sqlite(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary files."""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def test_from_sqlite(self):
+        """Test teams and cyclists load and a missing race table is tolerated."""
+        self.assertTrue(self.db.loaded)
+        self.assertEqual(len(self.db.teams), 2)
+        self.assertEqual(len(self.db.cyclists), 4)
+        self.assertEqual(self.db.races, [])
+
+    def test_match_team(self):
+        """Test exact, short-name, fuzzy and missing team matches."""
+        self.assertEqual(self.db.match_team("UAE Team Emirates"), (1, "UAE Team Emirates"))
+        self.assertEqual(self.db.match_team("TVL"), (2, "TVL"))
+        self.assertEqual(self.db.match_team("Visma | Lease a Bike"), (2, "Visma | Lease a Bike"))
+        self.assertEqual(self.db.match_team("Soudal Quick-Step"), (None, None))
+
+    def test_match_rider(self):
+        """Test accent- and case-insensitive rider matches."""
+        self.assertEqual(self.db.match_rider("Tadej Pogacar"), (10, "Tadej Pogačar"))
+        self.assertEqual(self.db.match_rider("Tadej POGAČAR", 1), (10, "Tadej Pogačar"))
+        self.assertEqual(self.db.match_rider("jonas vingegaard"), (20, "Jonas Vingegaard"))
+
+    def test_match_rider_prefers_team(self):
+        """Test the team breaks ties between riders with the same name."""
+        self.assertEqual(self.db.match_rider("Juan Ayuso", 2), (21, "Juan Ayuso"))
+        self.assertEqual(self.db.match_rider("Juan Ayuso", 1), (11, "Juan Ayuso Pesquera"))
+
+    def test_match_rider_no_match(self):
+        """Test unknown and single-word names give no match."""
+        self.assertEqual(self.db.match_rider("Remco Evenepoel"), (None, None))
+        self.assertEqual(self.db.match_rider("Pogacar"), (None, None))
+
+    def test_parsed_startlist_to_xml(self):
+        """Test a parsed page is matched and written as PCM startlist XML."""
+        output = os.path.join(self.temp_dir, "race.xml")
+        startlist = StartlistParser()._parse_html(FIRSTCYCLING_HTML)
+        self.assertTrue(PCMXmlWriter.write(startlist, output, db=self.db, log=lambda _: None))
+
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), (
+                '<startlist>\n'
+                '    <team id="1">\n'
+                '        <cyclist id="10" />\n'
+                '        <cyclist id="11" />\n'
+                '    </team>\n'
+                '    <team id="2">\n'
+                '        <cyclist id="20" />\n'
+                '    </team>\n'
+                '</startlist>\n'
+            ))
+
+
+class TestMultiplayerStartlist(unittest.TestCase):
+    """Test suite for apply_multiplayer_startlist."""
+
+    def setUp(self):
+        """Create a temp directory holding a stand-in CDB."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cdb_path = os.path.join(self.temp_dir, "career.cdb")
+        with open(self.cdb_path, "wb") as f:
+            f.write(b"cdb")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _fake_export(args, **kwargs):
+        """Stand in for SQLiteExporter by writing a small game database."""
+        path = os.path.splitext(args[-1])[0] + ".sqlite"
+        _create_game_db(path)
+        with closing(sqlite3.connect(path)) as conn:
+            conn.execute("CREATE TABLE DYN_contract_cyclist "
+                         "(IDcontract INTEGER PRIMARY KEY, fkIDcyclist INTEGER, fkIDteam INTEGER)")
+            conn.execute("INSERT INTO DYN_contract_cyclist VALUES (1, 10, 1), (2, 11, 1)")
+            conn.commit()
+        return MagicMock(returncode=0)
+
+    @staticmethod
+    def _helper_indexes(path):
+        """Return the names of the editor's helper indexes in a database."""
+        with closing(sqlite3.connect(path)) as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' "
+                "AND name LIKE 'pcmtools_fk_%'")]
+
+    @patch('core.converter.subprocess.run')
+    @patch('core.converter.os.path.exists')
+    def test_reused_working_copy_gives_clean_multiplayer_db(self, mock_exists, mock_run):
+        """Test the editor's helper indexes never reach the multiplayer copy."""
+        mock_exists.side_effect = lambda p: p == converter.TOOL_PATH or os.path.isfile(p)
+        mock_run.side_effect = self._fake_export
+
+        with patch('core.converter.tempfile.gettempdir', return_value=self.temp_dir), \
+                patch('core.startlist.tempfile.gettempdir', return_value=self.temp_dir):
+            # Opened in the editor: export, build helper indexes, stamp
+            working = converter.export_cdb_to_sqlite(self.cdb_path)
+            ensure_fk_indexes(working)
+            converter.stamp_working_db(working, self.cdb_path)
+
+            # The startlist tool opens the same CDB and gets the same file
+            self.assertEqual(converter.export_cdb_to_sqlite(self.cdb_path), working)
+            self.assertEqual(mock_run.call_count, 1)
+            self.assertTrue(self._helper_indexes(working))
+
+            output, moved, contracts = apply_multiplayer_startlist(working, {"1"}, {"10"})
+
+        self.assertEqual((moved, contracts), (1, 1))
+        self.assertEqual(self._helper_indexes(output), [])
+        # The editor's working copy keeps its indexes
+        self.assertTrue(self._helper_indexes(working))
+
+
+if __name__ == '__main__':
+    unittest.main()
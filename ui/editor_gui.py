@@ -11,8 +11,8 @@ import sys
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox, simpledialog
 
-from core.db_manager import DatabaseManager
-from core.app_state import AppState
+from core.db_manager import DatabaseManager, drop_fk_indexes, ensure_fk_indexes
+from core.app_state import AppState, UndoAction
 from core.constants import APP_NAME, APP_VERSION, SEARCH_DEBOUNCE_DELAY
 import core.converter as converter
 import core.csv_io as csv_io
@@ -224,15 +224,15 @@ class PCMDatabaseTools:
         if not action:
             return
 
-        if action.get("type") == "row_op":
-            self._handle_row_op(action, is_undo=True)
-        else:
+        if isinstance(action, UndoAction):
             self.db.update_cell(
-                action["table"], action["column"], action["old"],
-                self.table_view.tree["columns"][0], action["pk"],
+                action.table, action.column, action.old,
+                self.table_view.tree["columns"][0], action.pk,
             )
             self.unsaved_changes = True
             self.table_view.load_table_data()
+        else:
+            self._handle_row_op(action, is_undo=True)
         self._update_btns()
 
     def redo(self):
@@ -241,15 +241,15 @@ class PCMDatabaseTools:
         if not action:
             return
 
-        if action.get("type") == "row_op":
-            self._handle_row_op(action, is_undo=False)
-        else:
+        if isinstance(action, UndoAction):
             self.db.update_cell(
-                action["table"], action["column"], action["new"],
-                self.table_view.tree["columns"][0], action["pk"],
+                action.table, action.column, action.new,
+                self.table_view.tree["columns"][0], action.pk,
             )
             self.unsaved_changes = True
             self.table_view.load_table_data()
+        else:
+            self._handle_row_op(action, is_undo=False)
         self._update_btns()
 
     def _handle_row_op(self, action, is_undo):
@@ -270,8 +270,7 @@ class PCMDatabaseTools:
             if effective_op == "delete":
                 self.db.delete_rows(table, pk_col, [r["pk"] for r in rows])
             else:
-                for r in rows:
-                    self.db.insert_row(table, columns, r["data"])
+                self.db.insert_rows(table, columns, [r["data"] for r in rows])
 
             self.unsaved_changes = True
             self.table_view.load_table_data()
@@ -314,7 +313,12 @@ class PCMDatabaseTools:
 
         def task():
             gc.collect()
-            return converter.export_cdb_to_sqlite(path)
+            temp_path = converter.export_cdb_to_sqlite(path)
+            ensure_fk_indexes(temp_path)
+            # The helper FK indexes just written are not edits; keep the
+            # working copy reusable for the next open of this CDB
+            converter.stamp_working_db(temp_path, path)
+            return temp_path
 
         def on_success(temp_path):
             self.temp_path = temp_path
@@ -344,9 +348,18 @@ class PCMDatabaseTools:
         )
         if path:
             gc.collect()
+            temp_path = self.temp_path
 
             def task():
-                converter.import_sqlite_to_cdb(self.temp_path, path)
+                # Helper FK indexes are not part of the game schema; they
+                # come back even if the conversion fails. The index DDL runs
+                # on its own connection, never on self.db's, which stays
+                # with the UI thread.
+                drop_fk_indexes(temp_path)
+                try:
+                    converter.import_sqlite_to_cdb(temp_path, path)
+                finally:
+                    ensure_fk_indexes(temp_path)
 
             def on_complete(_):
                 self.unsaved_changes = False
@@ -593,7 +606,9 @@ class PCMDatabaseTools:
                 is_maximized = self.root.attributes('-zoomed')
         except (tk.TclError, AttributeError):
             pass
-        self.state.save_settings(self.normal_geometry, is_maximized, self.lookup_var.get())
+        self.state.save_settings(
+            self.normal_geometry, is_maximized, self.lookup_var.get(), fsync=True,
+        )
         if self.db:
             self.db.close()
         self.root.destroy()
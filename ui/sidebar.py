@@ -8,6 +8,14 @@ filterable table list below, supporting drag-and-drop reordering.
 import tkinter as tk
 from core.constants import FILTER_DEBOUNCE_DELAY
 
+# Tcl loop that stripes the first N listbox rows in one interpreter call:
+# (row count, listbox path, odd colour, even colour)
+_TCL_STRIPE = (
+    "for {set i 0} {$i < %d} {incr i} "
+    "{ %s itemconfigure $i -background [expr {$i %% 2 ? {%s} : {%s}}] }"
+)
+
+
 class Sidebar:
     """
     Navigation sidebar for browsing and selecting database tables.
@@ -31,6 +39,9 @@ class Sidebar:
         self.state = app_state
         self.on_table_select = on_table_select
         self.all_tables = []
+        self._table_set = frozenset()
+        # (name, lowercase name) pairs, so filtering lowercases nothing
+        self._tables_lower = []
         self.sidebar_even, self.sidebar_odd, self.fav_color = "#e8e8e8", "#fdfdfd", "#fff9c4"
         self.filter_timer = None
 
@@ -72,6 +83,8 @@ class Sidebar:
             tables (list[str]): List of table names to display
         """
         self.all_tables = tables
+        self._table_set = frozenset(tables)
+        self._tables_lower = [(t, t.lower()) for t in tables]
         self._execute_filter()  # Execute immediately when setting tables, not debounced
         self.refresh_favorites()
 
@@ -87,16 +100,23 @@ class Sidebar:
     def _execute_filter(self):
         """Execute the actual filtering based on search term."""
         term = self.filter_var.get().lower()
+        if term:
+            matches = [t for t, low in self._tables_lower if term in low]
+        else:
+            matches = list(self.all_tables)
         self.listbox.delete(0, "end")
-        for index, table in enumerate([t for t in self.all_tables if term in t.lower()]):
-            self.listbox.insert("end", table)
-            self.listbox.itemconfig(index, {'bg': self.sidebar_even if index % 2 == 0 else self.sidebar_odd})
+        if matches:
+            # One Tcl call for the inserts and one loop for the striping,
+            # rather than an insert and an itemconfig per table
+            self.listbox.insert("end", *matches)
+            self.listbox.tk.eval(_TCL_STRIPE % (
+                len(matches), self.listbox, self.sidebar_odd, self.sidebar_even))
         self.filter_timer = None
 
     def refresh_favorites(self):
         """Reload the favorites list from app state."""
         self.fav_lb.delete(0, "end")
-        for table in [f for f in self.state.favorites if f in self.all_tables]:
+        for table in [f for f in self.state.favorites if f in self._table_set]:
             self.fav_lb.insert("end", table)
 
     def on_select(self, widget):
@@ -152,7 +172,8 @@ class Sidebar:
             self.cur_fav_index = i
             
             visible = list(self.fav_lb.get(0, tk.END))
-            hidden = [f for f in self.state.favorites if f not in visible]
+            visible_set = set(visible)
+            hidden = [f for f in self.state.favorites if f not in visible_set]
             self.state.favorites = visible + hidden
     
     def select_first_favorite(self):
@@ -13,6 +13,18 @@ from core.constants import (
     RESIZE_SAVE_DELAY, DEFAULT_WINDOW_WIDTH,
 )
 
+# Tcl helper that inserts a whole page of rows in one interpreter call,
+# striping them from the given index. Each row is a list of cell strings.
+_TCL_INSERT_ROWS = """
+proc ::pcm_tree_insert_rows {tree rows index} {
+    foreach row $rows {
+        $tree insert {} end -values $row \\
+            -tags [expr {$index % 2 ? "oddrow" : "evenrow"}]
+        incr index
+    }
+}
+"""
+
 
 class TableView:
     """
@@ -52,6 +64,7 @@ class TableView:
         self.sort_state = {"column": None, "reverse": False}
         self.page_size = ROW_CHUNK_SIZE
         self.offset = 0
+        self._last_key = None
         self.total_rows = 0
         self.loading_data = False
         self.last_saved_widths = {}
@@ -67,6 +80,7 @@ class TableView:
         self.tree = ttk.Treeview(self.parent, show="headings", selectmode="extended")
         self.tree.tag_configure('oddrow', background="#f4f4f4")
         self.tree.tag_configure('evenrow', background="#ffffff")
+        self.tree.tk.eval(_TCL_INSERT_ROWS)
 
         self.vsb = ttk.Scrollbar(self.parent, command=self.tree.yview)
         self.hsb = ttk.Scrollbar(self.parent, orient="horizontal", command=self.tree.xview)
@@ -113,11 +127,18 @@ class TableView:
         self.sort_state = {"column": None, "reverse": False}
         self._configured_columns = []
         self._col_window_end = 0
+        if self.db:
+            # The previous table's search index is not needed any more
+            self.db.drop_search_indexes()
         self.load_table_data()
 
     def set_search_term(self, term):
         """Update the search filter and reload the table."""
         self.search_term = term
+        if term and self.db and self.current_table:
+            # Called once the search debounce fires; builds the table's
+            # search index on the first term that can use it
+            self.db.prepare_search(self.current_table, term)
         self.load_table_data()
 
     def set_lookup_mode(self, enabled):
@@ -200,7 +221,6 @@ class TableView:
 
         self.tree.grid_remove()
         self.offset = start_offset
-        self.total_rows = self.db.get_row_count(self.current_table, self.search_term, self.lookup_mode)
 
         # Set default sort to first column (primary key) if not set
         if self.sort_state["column"] is None:
@@ -208,15 +228,25 @@ class TableView:
             if temp_columns:
                 self.sort_state = {"column": temp_columns[0], "reverse": False}
 
-        columns, row_data = self.db.fetch_data(
-            self.current_table, self.search_term, self.lookup_mode,
-            self.page_size, self.offset,
-            self.sort_state["column"], self.sort_state["reverse"],
-        )
+        if self.search_term:
+            # Count and first page of a filtered view in a single scan
+            columns, row_data, self.total_rows = self.db.fetch_data_with_count(
+                self.current_table, self.search_term, self.lookup_mode,
+                self.page_size, self.offset,
+                self.sort_state["column"], self.sort_state["reverse"],
+            )
+        else:
+            self.total_rows = self.db.get_row_count(self.current_table)
+            columns, row_data = self.db.fetch_data(
+                self.current_table, None, self.lookup_mode,
+                self.page_size, self.offset,
+                self.sort_state["column"], self.sort_state["reverse"],
+            )
         self.offset += len(row_data)
 
         # Store all columns (including hidden ones)
         self.all_columns = columns
+        self._last_key = row_data[-1][0] if row_data else None
 
         # Filter to visible columns
         display_columns, _, filtered_rows = self._filter_visible(columns, row_data)
@@ -256,9 +286,7 @@ class TableView:
 
         # Insert rows
         self.tree.delete(*self.tree.get_children())
-        for index, row in enumerate(filtered_rows):
-            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=row, tags=(tag,))
+        self._insert_rows(filtered_rows, 0)
         self.tree.grid()
 
     def load_more_data(self):
@@ -267,21 +295,56 @@ class TableView:
             return
         self.loading_data = True
 
+        after_key = self._seek_key()
         _, row_data = self.db.fetch_data(
             self.current_table, self.search_term, self.lookup_mode,
-            self.page_size, self.offset,
+            self.page_size, 0 if after_key is not None else self.offset,
             self.sort_state["column"], self.sort_state["reverse"],
+            after_key=after_key,
         )
+        if row_data:
+            self._last_key = row_data[-1][0]
 
         _, _, filtered_rows = self._filter_visible(self.all_columns, row_data)
 
-        start_idx = self.offset
-        for index, row in enumerate(filtered_rows):
-            tag = 'evenrow' if (start_idx + index) % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=row, tags=(tag,))
+        self._insert_rows(filtered_rows, self.offset)
         self.offset += len(row_data)
         self.loading_data = False
 
+    def _insert_rows(self, rows, start_index):
+        """Append rows to the tree in a single Tcl call.
+
+        Cells are passed as their str() text, which is what
+        ``Treeview.insert(values=...)`` displays, so the result matches
+        inserting row by row without a Python-to-Tcl round trip per row.
+
+        Args:
+            rows (list[tuple]): Display rows to append
+            start_index (int): Overall index of the first row, for striping
+        """
+        if rows:
+            self.tree.tk.call(
+                "::pcm_tree_insert_rows", self.tree,
+                tuple(tuple(map(str, row)) for row in rows), start_index,
+            )
+
+    def _seek_key(self):
+        """Return the key to continue after with keyset pagination, or None.
+
+        Deeper pages are sought past the last value only when sorting on
+        the table's seek column, a unique non-NULL first column (see
+        DatabaseManager.get_seek_column); any other sort order falls back
+        to OFFSET.
+        """
+        key_col = self.all_columns[0] if self.all_columns else None
+        if self.sort_state["column"] != key_col or self._last_key is None:
+            return None
+        if key_col != self.db.get_seek_column(self.current_table):
+            return None  # duplicates or NULLs would be skipped
+        if self.lookup_mode and key_col.startswith("fkID"):
+            return None  # shown value is the resolved name, not the key
+        return self._last_key
+
     def _load_more_columns(self):
         """Expand the column display window when scrolling right."""
         if not self._configured_columns or self._col_window_end >= len(self._configured_columns):
@@ -379,8 +442,10 @@ class TableView:
         """Save the active editor value to the database and push an undo entry.
 
         Args:
-            reload_data: If True, fully reload the table. If False, update
-                the Treeview row in-place (used during keyboard navigation).
+            reload_data: If True, reload the table when the edit can move
+                or filter out the row (sorted or searched column). If
+                False, always update the Treeview row in-place (used during
+                keyboard navigation).
         """
         if not self.active_editor:
             return
@@ -410,7 +475,10 @@ class TableView:
             self.state.push_undo(self.current_table, col_name, undo_old_val, db_val, pk_val)
             self.on_change()
             self.db.update_cell(self.current_table, col_name, db_val, self.tree["columns"][0], pk_val)
-            if reload_data:
+            # Only a change to the sort column or under an active search can
+            # move the row or drop it from the view; anything else is shown
+            # in place without re-querying the page
+            if reload_data and (self.search_term or col_name == self.sort_state["column"]):
                 self.load_table_data()
             else:
                 new_values = list(data['values'])
@@ -581,9 +649,10 @@ class TableView:
                     continue
                 row_data = list(source_data)
                 row_data[0] = next_id
-                self.db.insert_row(self.current_table, columns, row_data)
                 added_rows.append({"pk": next_id, "data": row_data})
                 next_id += 1
+            self.db.insert_rows(
+                self.current_table, columns, [r["data"] for r in added_rows])
 
             if added_rows:
                 action = {
@@ -655,7 +724,30 @@ class TableView:
             self.state.push_action(action)
 
         self.on_change()
-        self.load_table_data()
+        self._remove_rows(selection)
+
+    def _remove_rows(self, items):
+        """Drop deleted rows from the tree without reloading the page.
+
+        Restripes the rows after the first removed one and shrinks the
+        pagination counters so the next page continues at the right row.
+
+        Args:
+            items (tuple): Treeview item IDs of the deleted rows
+        """
+        children = self.tree.get_children()
+        first = min(self.tree.index(item) for item in items)
+        self.tree.delete(*items)
+        self.offset = max(0, self.offset - len(items))
+        self.total_rows = max(0, self.total_rows - len(items))
+
+        removed = set(items)
+        index = first
+        for item in children[first:]:
+            if item in removed:
+                continue
+            self.tree.item(item, tags=('evenrow' if index % 2 == 0 else 'oddrow',))
+            index += 1
 
     # ------------------------------------------------------------------
     # Context menus
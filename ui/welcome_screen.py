@@ -126,7 +126,7 @@ class WelcomeScreen:
         if not os.path.exists(path):
             messagebox.showerror("Error", f"File not found:\n{path}")
             if path in self.state.recents:
-                self.state.recents.remove(path)
+                self.state.remove_recent(path)
                 self.show()
             return
         self.load_callback(path)